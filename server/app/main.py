@@ -5,6 +5,7 @@ from app.routers import agents
 from app.routers import agents_v1
 from .models import init_db, SessionLocal
 from sqlalchemy import text
+import asyncio
 import logging
 
 # Custom logging filter to reduce noise from SSE stream endpoints
@@ -67,3 +68,13 @@ app.include_router(agents_v1.router, prefix="/api/agents", tags=["agents-v1"])
 @app.on_event("startup")
 def _startup():
     init_db()
+
+
+@app.on_event("shutdown")
+async def _shutdown():
+    from app.utils import free_antibot, free_proxy_sources, net
+    await free_antibot.aclose_client()
+    # driver.quit() blocks; keep it off the event loop
+    await asyncio.to_thread(free_antibot.shutdown_browsers)
+    await free_proxy_sources.aclose_client()
+    await net.aclose_client()
@@ -0,0 +1,31 @@
+from app.utils.extractor import SimpleJobExtractor
+
+
+def test_normalize_date_formats():
+    ex = SimpleJobExtractor()
+    assert ex._normalize_date("2024-01-05") == "2024-01-05"
+    assert ex._normalize_date("1/5/2024") == "2024-01-05"
+    assert ex._normalize_date("05-01-2024") == "2024-01-05"
+    assert ex._normalize_date("January 5, 2024") == "2024-01-05"
+    # Right shape but invalid values, and unknown shapes
+    assert ex._normalize_date("13/40/2024") is None
+    assert ex._normalize_date("yesterday") is None
+
+
+def test_extract_regex_salary_and_skills():
+    ex = SimpleJobExtractor()
+    out = ex._extract_regex("Pay: $120k - $150k per year. Stack: Python, Docker")
+    assert set(out["skills"]) == {"Python", "Docker"}
+    assert out["salary"]["min"] == 120000.0
+    assert out["salary"]["max"] == 150000.0
+    # No skill hints and a bare date range: nothing extracted
+    assert ex._extract_regex("Open 2019 - 2020 for everyone") == {}
+
+
+def test_extract_results_are_cached_and_isolated():
+    html = "<html><head><title>Backend Engineer | Acme</title></head><body></body></html>"
+    first = SimpleJobExtractor().extract("https://acme.example/jobs/1", html)
+    first["provenance"]["warnings"].append("mutated by caller")
+    second = SimpleJobExtractor().extract("https://acme.example/jobs/1", html)
+    assert second["title"] == first["title"]
+    assert "mutated by caller" not in second["provenance"]["warnings"]
@@ -0,0 +1,126 @@
+import asyncio
+
+import httpcore
+import httpx
+import pytest
+
+from app.utils import free_antibot
+
+
+class _StubAlternatives:
+    def __init__(self, fast=None, slow=None):
+        self.fast = fast or {}
+        self.slow = slow or {}
+        self.slow_calls = []
+
+    async def _fast(self, name, url):
+        delay, result = self.fast[name]
+        await asyncio.sleep(delay)
+        return result
+
+    async def fetch_with_requests_session(self, url, proxy=None):
+        return await self._fast("requests_session", url)
+
+    async def fetch_with_curl_subprocess(self, url, proxy=None):
+        return await self._fast("curl", url)
+
+    async def _slow(self, name, url, timeout):
+        self.slow_calls.append((name, timeout))
+        return self.slow.get(name, ("", 0))
+
+    async def fetch_with_undetected_chrome(self, url, timeout=30.0):
+        return await self._slow("undetected_chrome", url, timeout)
+
+    async def fetch_with_selenium(self, url, timeout=30.0):
+        return await self._slow("selenium", url, timeout)
+
+
+@pytest.fixture
+def antibot(monkeypatch):
+    monkeypatch.setattr(free_antibot, "_RESP_CACHE", free_antibot.TTLCache(maxsize=16, ttl=60))
+    return free_antibot.FreeAntiBot.__new__(free_antibot.FreeAntiBot)
+
+
+def test_is_blocked_matches_challenge_pages():
+    assert free_antibot._is_blocked("<title>Checking your browser</title>")
+    assert free_antibot._is_blocked("Please complete the CAPTCHA")
+    assert not free_antibot._is_blocked("<h1>Senior Engineer</h1>")
+
+
+def test_race_skips_blocked_response_and_takes_next(antibot):
+    blocked = f"<html>{free_antibot.BLOCK_INDICATORS[0]}</html>"
+    antibot.scraping_alternatives = _StubAlternatives(fast={
+        "requests_session": (0, (blocked, 200)),
+        "curl": (0.01, ("<html>job</html>", 200)),
+    })
+    assert asyncio.run(antibot.fetch_antibot_free("https://acme.com/j/1")) == ("<html>job</html>", 200)
+    assert antibot.scraping_alternatives.slow_calls == []
+
+
+def test_race_respects_caller_timeout_before_browsers(antibot):
+    alt = _StubAlternatives(
+        fast={"requests_session": (5, ("late", 200)), "curl": (5, ("late", 200))},
+        slow={"undetected_chrome": ("<html>browser</html>", 200)},
+    )
+    antibot.scraping_alternatives = alt
+    result = asyncio.run(antibot.fetch_antibot_free("https://acme.com/j/2", timeout=0.05))
+    assert result == ("<html>browser</html>", 200)
+    assert alt.slow_calls == [("undetected_chrome", 0.05)]
+
+
+class _FlakyBackend(httpcore.AsyncNetworkBackend):
+    def __init__(self, unreachable):
+        self.unreachable = unreachable
+        self.tried = []
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        self.tried.append(host)
+        if host in self.unreachable:
+            raise httpcore.ConnectError(f"{host} unreachable")
+        return host
+
+
+def test_dns_backend_falls_back_through_cached_addresses(monkeypatch):
+    monkeypatch.setattr(free_antibot, "_DNS_CACHE", {"acme.com": ("2001:db8::1", "192.0.2.1")})
+    inner = _FlakyBackend({"2001:db8::1"})
+    backend = free_antibot._CachingDNSBackend(inner)
+    assert asyncio.run(backend.connect_tcp("acme.com", 443)) == "192.0.2.1"
+    # The address that answered leads from now on
+    assert free_antibot._DNS_CACHE["acme.com"] == ("192.0.2.1", "2001:db8::1")
+
+    inner.unreachable.add("192.0.2.1")
+    with pytest.raises(httpcore.ConnectError):
+        asyncio.run(backend.connect_tcp("acme.com", 443))
+    assert inner.tried == ["2001:db8::1", "192.0.2.1", "192.0.2.1", "2001:db8::1"]
+    assert "acme.com" not in free_antibot._DNS_CACHE
+
+
+def test_session_cookies_follow_redirects(monkeypatch):
+    seen = []
+
+    def handler(request):
+        seen.append((request.url.path, request.headers.get("cookie")))
+        if request.url.path == "/":
+            return httpx.Response(200, headers={"set-cookie": "sid=1; Path=/"})
+        if request.url.path == "/job":
+            return httpx.Response(301, headers={"location": "/job/"})
+        if request.url.path == "/gate":
+            return httpx.Response(302, headers={"set-cookie": "cf=ok; Path=/", "location": "/job/"})
+        return httpx.Response(200, text="<html>job</html>")
+
+    monkeypatch.setattr(free_antibot, "_build_transport", lambda proxy=None: httpx.MockTransport(handler))
+    monkeypatch.setattr(free_antibot, "_CLIENT", None)
+    monkeypatch.setattr(free_antibot, "_session_cookies", free_antibot.LRUCache(maxsize=4))
+    alt = free_antibot.FreeScrapingAlternatives.__new__(free_antibot.FreeScrapingAlternatives)
+
+    assert asyncio.run(alt.fetch_with_requests_session("https://acme.com/job")) == ("<html>job</html>", 200)
+    assert asyncio.run(alt.fetch_with_requests_session("https://acme.com/gate")) == ("<html>job</html>", 200)
+    assert seen == [
+        ("/", None),
+        ("/job", "sid=1"),
+        ("/job/", "sid=1"),
+        ("/gate", "sid=1"),
+        ("/job/", "sid=1; cf=ok"),
+    ]
+    # The shared client keeps nothing; the host's session lives in _session_cookies
+    assert len(free_antibot._get_client().cookies.jar) == 0
@@ -0,0 +1,32 @@
+from app.utils.free_proxy_sources import FreeProxySources
+
+
+def test_is_valid_proxy_line():
+    src = FreeProxySources()
+    assert src._is_valid_proxy_line("1.2.3.4:80")
+    assert src._is_valid_proxy_line(" 255.255.255.255:65535\r")
+    assert not src._is_valid_proxy_line("256.1.1.1:80")
+    assert not src._is_valid_proxy_line("1.2.3:80")
+    assert not src._is_valid_proxy_line("1.2.3.4:0")
+    assert not src._is_valid_proxy_line("1.2.3.4:65536")
+    assert not src._is_valid_proxy_line("1.2.3.4")
+    assert not src._is_valid_proxy_line("")
+
+
+def test_parse_proxy_batch():
+    src = FreeProxySources()
+    text = "1.2.3.4:80\r\nnot a proxy\n 10.0.0.1:8080 \n999.1.1.1:80\n5.6.7.8:3128"
+    proxies = src._parse_proxy_batch(text)
+    assert proxies == [
+        "http://1.2.3.4:80",
+        "http://10.0.0.1:8080",
+        "http://5.6.7.8:3128",
+    ]
+
+
+def test_parse_proxy_batch_skips_already_seen():
+    src = FreeProxySources()
+    seen = {"1.2.3.4:80"}
+    proxies = src._parse_proxy_batch("1.2.3.4:80\n5.6.7.8:3128\n5.6.7.8:3128", seen)
+    assert proxies == ["http://5.6.7.8:3128"]
+    assert seen == {"1.2.3.4:80", "5.6.7.8:3128"}
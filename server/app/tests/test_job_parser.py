@@ -0,0 +1,56 @@
+from app.utils.job_parser import parse_job_from_html
+
+
+def _page(*scripts: str, body: str = "") -> str:
+    blocks = "".join(f'<script type="application/ld+json">{s}</script>' for s in scripts)
+    return f"<html><head>{blocks}</head><body>{body}</body></html>"
+
+
+def test_jsonld_jobposting_inside_graph():
+    html = _page(
+        '{"@type": "BreadcrumbList", "itemListElement": []}',
+        '{"@context": "https://schema.org", "@graph": [{"@type": "WebPage"},'
+        ' {"@type": "JobPosting", "title": "Data Engineer",'
+        ' "hiringOrganization": {"name": "Acme"}, "description": "<p>Build pipelines</p>"}]}',
+    )
+    job = parse_job_from_html("https://acme.com/jobs/1", html)
+    assert job["title"] == "Data Engineer"
+    assert job["company"] == "Acme"
+    assert "Build pipelines" in job["description"]
+
+
+def test_invalid_jsonld_falls_back_to_generic():
+    html = _page('{"@type": "JobPosting", broken', body="<h1>Platform Engineer</h1>")
+    job = parse_job_from_html("https://acme.com/jobs/2", html)
+    assert job["title"] == "Platform Engineer"
+
+
+def test_ats_parser_dispatched_by_host():
+    body = (
+        '<h1 class="app-title">Backend Engineer</h1><div class="location">Remote</div>'
+        '<div id="content">Own the payments API.</div>'
+    )
+    job = parse_job_from_html("https://boards.greenhouse.io/acme/jobs/3", _page(body=body))
+    assert job["title"] == "Backend Engineer"
+    assert job["location"] == "Remote"
+    assert job["description"] == "Own the payments API."
+
+
+def test_duplicate_content_reuses_parse_with_own_source_url():
+    html = _page(body="<h1>Mirror Engineer</h1>")
+    first = parse_job_from_html("https://mirror-a.com/jobs/9", html)
+    first["title"] = "mutated"
+    second = parse_job_from_html("https://mirror-b.com/jobs/9", html)
+    assert second["title"] == "Mirror Engineer"
+    assert second["source_url"] == "https://mirror-b.com/jobs/9"
+
+
+def test_generic_selectors_pick_the_matching_element_not_its_wrapper():
+    body = (
+        '<section class="job-title-area"><span class="title">Site Reliability Engineer</span>'
+        '<p>Posted yesterday</p></section>'
+        '<div class="meta-location-block"><span class="location">Berlin</span><span>Hybrid</span></div>'
+    )
+    job = parse_job_from_html("https://acme.com/jobs/10", _page(body=body))
+    assert job["title"] == "Site Reliability Engineer"
+    assert job["location"] == "Berlin"
@@ -0,0 +1,21 @@
+from app.utils.job_sites import extract_with_site_patterns
+
+
+def test_lever_title_is_nested_h2_not_headline_container():
+    html = (
+        '<html><body><div class="posting-headline"><h2>Staff Data Engineer</h2>'
+        '<div class="posting-categories"><div class="location">Toronto</div>'
+        '<div class="commitment">Full-time</div></div></div></body></html>'
+    )
+    data = extract_with_site_patterns("https://jobs.lever.co/acme/123", html)
+    assert data["title"] == "Staff Data Engineer"
+    assert data["location"] == "Toronto"
+
+
+def test_meta_selector_reads_content_attribute():
+    html = (
+        '<html><head><meta property="og:site_name" content="Acme Corp"></head>'
+        '<body><div class="posting-headline"><h2>Analyst</h2></div></body></html>'
+    )
+    data = extract_with_site_patterns("https://jobs.lever.co/acme/456", html)
+    assert data["company"] == "Acme Corp"
@@ -0,0 +1,33 @@
+from app.utils.lever_extractor import LeverJobExtractor
+
+
+def test_location_is_nested_category_not_matching_container():
+    html = (
+        '<html><body><div class="posting-headline"><h2>Backend Engineer</h2></div>'
+        '<div class="location-block"><span class="posting-category location">Paris</span>'
+        '<span>Relocation offered</span></div></body></html>'
+    )
+    job = LeverJobExtractor().extract_lever_job("https://jobs.lever.co/acme/1", html)
+    assert job["title"] == "Backend Engineer"
+    assert job["location"] == "Paris"
+
+
+def test_complete_jsonld_keeps_dom_only_fields():
+    posting = (
+        '{"@context": "https://schema.org", "@type": "JobPosting", "title": "Platform Engineer",'
+        ' "hiringOrganization": {"name": "Acme"},'
+        ' "jobLocation": {"address": {"addressLocality": "Austin", "addressRegion": "TX"}},'
+        ' "description": "<p>Run the platform team and own reliability for every service.</p>"}'
+    )
+    html = (
+        f'<html><head><script type="application/ld+json">{posting}</script></head><body>'
+        '<div class="posting-headline"><h2>Ignored Headline</h2></div>'
+        '<div class="posting-categories"><div class="location">Remote</div>'
+        '<div class="department">Infra /</div><div class="commitment">Full Time</div></div>'
+        '</body></html>'
+    )
+    job = LeverJobExtractor().extract_lever_job("https://jobs.lever.co/acme/2", html)
+    # Core fields come from JSON-LD; department and commitment only exist in the DOM
+    assert (job["title"], job["company"], job["location"]) == ("Platform Engineer", "Acme", "Austin, TX")
+    assert job["department"] == "Infra"
+    assert job["employment_type"] == "full-time"
@@ -0,0 +1,48 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.utils import net
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    calls = []
+    responses = []
+
+    def handler(request):
+        calls.append(str(request.url))
+        return responses.pop(0)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(net, "_CLIENT", client)
+    monkeypatch.setattr(net, "_HTML_CACHE", net.TTLCache(maxsize=16, ttl=10))
+    monkeypatch.setattr(net, "_RATE_LIMIT", net.TTLCache(maxsize=16, ttl=net._HOST_MIN_INTERVAL))
+    monkeypatch.delenv("PROXY_URLS", raising=False)
+    return calls, responses
+
+
+def test_split_proxy_urls():
+    assert net._split_proxy_urls(" http://a:1, http://b:2\nhttp://c:3 ") == ("http://a:1", "http://b:2", "http://c:3")
+
+
+def test_fetch_html_serves_repeat_url_from_cache(fake_client):
+    calls, responses = fake_client
+    responses.append(httpx.Response(200, text="<html>ok</html>"))
+    first = asyncio.run(net.fetch_html("https://acme.com/jobs/1"))
+    second = asyncio.run(net.fetch_html("https://acme.com/jobs/1"))
+    assert first == second == ("<html>ok</html>", 200)
+    assert calls == ["https://acme.com/jobs/1"]
+
+
+def test_fetch_html_retries_until_usable(fake_client, monkeypatch):
+    calls, responses = fake_client
+
+    async def no_sleep(_):
+        return None
+
+    monkeypatch.setattr(net.asyncio, "sleep", no_sleep)
+    responses.extend([httpx.Response(503, text="busy"), httpx.Response(200, text="<html>ok</html>")])
+    assert asyncio.run(net.fetch_html("https://acme.com/jobs/2", tries=3)) == ("<html>ok</html>", 200)
+    assert len(calls) == 2
@@ -0,0 +1,26 @@
+from app.utils.normalize import html_to_text_preserve_lists, normalize_jd_text
+
+
+def test_lists_headings_and_paragraphs_become_lines():
+    html = (
+        "<div><h2>About the role</h2><p>Build data tooling.</p>"
+        "<ul><li>Python</li><li>SQL</li></ul><ol><li>Apply</li><li>Interview</li></ol>"
+        "<script>track()</script></div>"
+    )
+    assert html_to_text_preserve_lists(html) == (
+        "About the role\n\nBuild data tooling.\n\n- Python\n- SQL\n\n1. Apply\n2. Interview"
+    )
+
+
+def test_deeply_nested_markup_keeps_document_order():
+    # Deeper than the default recursion limit; the walk is iterative
+    html = "<div>" * 1500 + "<p>first</p><p>second</p>" + "</div>" * 1500
+    assert html_to_text_preserve_lists(html) == "first\n\nsecond"
+
+
+def test_known_headings_are_renamed_and_reordered():
+    html = (
+        "<h3>Benefits</h3><ul><li>Equity</li></ul>"
+        "<h3>Requirements</h3><ul><li>5 years of Go</li></ul>"
+    )
+    assert normalize_jd_text(html) == "Requirements:\n- 5 years of Go\n\nBenefits:\n- Equity"
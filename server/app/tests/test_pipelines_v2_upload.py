@@ -4,9 +4,12 @@ import json
 from fastapi.testclient import TestClient
 
 from app.main import app
+from app.models import init_db
 
 
 def test_upload_persists_and_enqueues(monkeypatch):
+    # The local SQLite file is runtime state and may be fresh; startup hooks don't run here
+    init_db()
     client = TestClient(app)
 
     # monkeypatch storage.upload_bytes to return predictable URI
@@ -0,0 +1,86 @@
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from app.utils import queue
+
+
+@pytest.fixture
+def r(monkeypatch):
+    client = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(queue, "_CLIENT", client)
+    monkeypatch.setattr(queue, "_HAS_BLMPOP", None)
+    monkeypatch.setattr(queue, "_SET_STATUS_SCRIPT", None)
+    return client
+
+
+def test_enqueue_stores_hash_and_get_job_round_trips(r):
+    job_id = queue.enqueue_crawl("https://acme.com/jobs/1", {"source": "test"})
+    assert r.type(queue.JOB_PREFIX + job_id) == "hash"
+    assert r.lrange(queue.QUEUE_KEY, 0, -1) == [job_id]
+    job = queue.get_job(job_id)
+    assert job["url"] == "https://acme.com/jobs/1"
+    assert job["meta"] == {"source": "test"}
+    assert isinstance(job["created_at"], int)
+    assert queue.get_job("missing") is None
+
+
+def test_enqueue_crawl_many_chunks_and_keeps_order(r, monkeypatch):
+    monkeypatch.setattr(queue, "_PIPELINE_CHUNK", 2)
+    urls = [f"https://acme.com/jobs/{i}" for i in range(5)]
+    job_ids = queue.enqueue_crawl_many(urls)
+    assert r.lrange(queue.QUEUE_KEY, 0, -1) == job_ids
+    assert [job["url"] for job in queue.get_jobs_many(job_ids)] == urls
+
+
+def test_set_job_status_updates_fields_in_place(r):
+    jd_id = queue.enqueue_jd_analysis("p1", "https://acme.com/jd")
+    big = {"description": "Own the ingestion pipeline. " * 200}
+    queue.set_job_status(jd_id, "completed", data=big)
+    # Large values are stored compressed and come back intact
+    assert r.hget(queue.JD_JOB_PREFIX + jd_id, "data").startswith("Z")
+    job = queue.get_job(jd_id)
+    assert job["status"] == "completed"
+    assert job["data"] == big
+    assert job["pipeline_id"] == "p1"
+    assert not r.exists(queue.JOB_PREFIX + jd_id)
+
+
+def test_set_job_status_on_unknown_id_creates_crawl_job(r):
+    queue.set_job_status("ghost", "failed", error="boom")
+    job = queue.get_job("ghost")
+    assert set(job) == {"id", "status", "error", "updated_at"}
+    assert (job["status"], job["error"]) == ("failed", "boom")
+    assert r.type(queue.JOB_PREFIX + "ghost") == "hash"
+
+
+def test_legacy_string_job_is_read_and_converted(r):
+    r.set(queue.JOB_PREFIX + "old", '{"id": "old", "url": "https://acme.com/x", "status": "queued"}')
+    assert queue.get_job("old")["url"] == "https://acme.com/x"
+    queue.set_job_status("old", "running")
+    assert r.type(queue.JOB_PREFIX + "old") == "hash"
+    job = queue.get_job("old")
+    assert job["status"] == "running"
+    assert job["url"] == "https://acme.com/x"
+
+
+def test_fetch_next_jobs_any_falls_back_to_blpop(r):
+    # fakeredis has no INFO, so the version probe reports no BLMPOP
+    crawl_id = queue.enqueue_crawl("https://acme.com/jobs/1")
+    queue.enqueue_crawl("https://acme.com/jobs/2")
+    jobs = queue.fetch_next_jobs_any([queue.JD_QUEUE_KEY, queue.QUEUE_KEY], timeout=1, count=5)
+    assert queue._HAS_BLMPOP is False
+    assert [job["id"] for job in jobs] == [crawl_id]
+    assert jobs[0]["_queue"] == queue.QUEUE_KEY
+
+
+def test_fetch_next_jobs_any_pops_batches_with_blmpop(r, monkeypatch):
+    monkeypatch.setattr(queue, "_HAS_BLMPOP", True)
+    crawl_ids = queue.enqueue_crawl_many([f"https://acme.com/jobs/{i}" for i in range(3)])
+    jd_id = queue.enqueue_jd_analysis("p1", "https://acme.com/jd")
+    keys = [queue.JD_QUEUE_KEY, queue.QUEUE_KEY]
+    # The JD queue comes first in priority order
+    assert [job["id"] for job in queue.fetch_next_jobs_any(keys, timeout=1, count=2)] == [jd_id]
+    jobs = queue.fetch_next_jobs_any(keys, timeout=1, count=2)
+    assert [job["id"] for job in jobs] == crawl_ids[:2]
+    assert queue.fetch_next_job_any(keys, timeout=1)["id"] == crawl_ids[2]
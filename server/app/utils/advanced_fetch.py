@@ -180,8 +180,8 @@ class IPRotationManager:
     async def _fetch_with_browser_automation(self, url: str) -> Tuple[str, int]:
         """Fetch using browser automation (Selenium/undetected-chrome)"""
         try:
-            from .free_antibot import FreeScrapingAlternatives
-            alternatives = FreeScrapingAlternatives()
+            from .free_antibot import get_scraping_alternatives
+            alternatives = get_scraping_alternatives()
             
             # Try undetected chrome first, then regular selenium
             if alternatives.undetected_chrome_available:
@@ -5,28 +5,61 @@ Enhanced job extractor with site-specific patterns and robust fallbacks.
 Priority: JSON-LD -> site patterns -> microdata -> DOM/regex fallbacks.
 """
 
+import copy
+import hashlib
 import json
 import re
+import threading
+from itertools import chain
 from datetime import datetime, timezone
 from typing import Any, Dict, Optional, List
 from pathlib import Path
 from urllib.parse import urlparse
 
+from cachetools import LRUCache
+
 from .job_sites import extract_with_site_patterns, enhance_job_data
 from .ai_extractor import AIJobExtractor
 
+# (url, use_ai, content digest) -> extraction result; shared across instances
+# since callers typically construct a fresh SimpleJobExtractor per request.
+_RESULT_CACHE: LRUCache = LRUCache(maxsize=1024)
+_RESULT_CACHE_LOCK = threading.Lock()
+
+# Date shape -> strptime format; a cheap regex match picks the single format to try
+_DATE_DISPATCH = [
+    (re.compile(r"^\d{4}-\d{1,2}-\d{1,2}$"), "%Y-%m-%d"),
+    (re.compile(r"^\d{1,2}/\d{1,2}/\d{4}$"), "%m/%d/%Y"),
+    (re.compile(r"^\d{1,2}-\d{1,2}-\d{4}$"), "%d-%m-%Y"),
+    (re.compile(r"^[A-Za-z]+ \d{1,2}, \d{4}$"), "%B %d, %Y"),
+]
+
+_SALARY_RE = re.compile(
+    r'\$?(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s*(?:k|K|thousand)?\s*(?:-|to)\s*\$?(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s*(?:k|K|thousand)?\s*(?:per\s+)?(year|annual|hour|month)?',
+    re.IGNORECASE | re.ASCII,
+)
+_SALARY_HINT_RE = re.compile(
+    r"\b(per|hour|year|annual|month|salary|compensation|pay)\b",
+    re.IGNORECASE | re.ASCII,
+)
+
+# Common skill patterns; the groups never match overlapping text, so they are fused into
+# one alternation and the page is scanned once
+_SKILL_PATTERNS = (
+    r"\b(?:JavaScript|TypeScript|Python|Java|C\+\+|C#|Go|Rust|PHP|Ruby|Swift|Kotlin)\b",
+    r"\b(?:React|Vue|Angular|Svelte|Node\.js|Express|Django|Flask|FastAPI|Spring)\b",
+    r"\b(?:AWS|Azure|GCP|Docker|Kubernetes|Jenkins|Git|PostgreSQL|MySQL|MongoDB)\b",
+    r"\b(?:HTML|CSS|SQL|REST|GraphQL|API|CI/CD|DevOps|Agile|Scrum)\b",
+)
+_SKILL_RE = re.compile("|".join(_SKILL_PATTERNS), re.IGNORECASE)
+
 
 class SimpleJobExtractor:
     """Minimal job extractor for server-side usage."""
 
     def __init__(self) -> None:
         # Common skill patterns
-        self.skill_patterns = [
-            r"\b(?:JavaScript|TypeScript|Python|Java|C\+\+|C#|Go|Rust|PHP|Ruby|Swift|Kotlin)\b",
-            r"\b(?:React|Vue|Angular|Svelte|Node\.js|Express|Django|Flask|FastAPI|Spring)\b",
-            r"\b(?:AWS|Azure|GCP|Docker|Kubernetes|Jenkins|Git|PostgreSQL|MySQL|MongoDB)\b",
-            r"\b(?:HTML|CSS|SQL|REST|GraphQL|API|CI/CD|DevOps|Agile|Scrum)\b",
-        ]
+        self.skill_patterns = list(_SKILL_PATTERNS)
 
         self.employment_type_map = {
             "full time": "full-time",
@@ -54,6 +87,20 @@ class SimpleJobExtractor:
             return []
 
     def extract(self, url: str, html: str, use_ai: bool = False) -> Dict[str, Any]:
+        raw = html.encode("utf-8", "surrogatepass") if isinstance(html, str) else (html or b"")
+        key = (url, use_ai, hashlib.blake2b(raw, digest_size=16).digest())
+        with _RESULT_CACHE_LOCK:
+            cached = _RESULT_CACHE.get(key)
+        if cached is None:
+            cached = self._extract_uncached(url, html, use_ai)
+            with _RESULT_CACHE_LOCK:
+                _RESULT_CACHE[key] = cached
+        # Hand out copies so callers can mutate results without poisoning the cache
+        result = copy.deepcopy(cached)
+        result["retrieved_at"] = datetime.now(timezone.utc).isoformat()
+        return result
+
+    def _extract_uncached(self, url: str, html: str, use_ai: bool) -> Dict[str, Any]:
         if use_ai:
             # Use AI-powered dynamic extraction
             return self.extract_with_ai(url, html)
@@ -64,7 +111,15 @@ class SimpleJobExtractor:
         prof_dom = self._extract_with_profile(url, html)
         microdata = self._extract_microdata(html)
         dom = self._extract_dom(html)
-        regexd = self._extract_regex(html)
+        # Scan the extracted description rather than the raw markup; fall back
+        # to the full page only when no description was found.
+        text_corpus = (
+            dom.get("description")
+            or json_ld.get("description")
+            or site_patterns.get("description")
+            or html
+        )
+        regexd = self._extract_regex(text_corpus)
 
         field_sources: Dict[str, str] = {}
         data = self._merge(json_ld, site_patterns, prof_dom, microdata, dom, regexd, field_sources)
@@ -129,14 +184,21 @@ class SimpleJobExtractor:
         
         # Merge lists (requirements, benefits)
         for list_field in ['requirements', 'benefits']:
-            ai_items = ai_data.get(list_field, [])
-            traditional_items = merged.get(list_field, [])
-            
-            # Combine and deduplicate
-            all_items = list(traditional_items) + list(ai_items)
+            ai_items = ai_data.get(list_field) or []
+            traditional_items = merged.get(list_field) or []
+
+            # Trivial cases: nothing to merge against (common when AI fails)
+            if not ai_items:
+                merged[list_field] = list(traditional_items)[:10]
+                continue
+            if not traditional_items:
+                merged[list_field] = list(ai_items)[:10]
+                continue
+
+            # Combine and deduplicate in a single pass
             unique_items = []
             seen = set()
-            for item in all_items:
+            for item in chain(traditional_items, ai_items):
                 if isinstance(item, str):
                     item_lower = item.lower().strip()
                     if item_lower not in seen and len(item.strip()) > 10:
@@ -380,24 +442,19 @@ class SimpleJobExtractor:
         if not text:
             return result
         # skills
-        skills = set()
-        for pat in self.skill_patterns:
-            for m in re.findall(pat, text, re.IGNORECASE):
-                if m:
-                    skills.add(m.strip())
+        skills = {m.strip() for m in _SKILL_RE.findall(text)}
         if skills:
             result["skills"] = list(skills)[:50]
 
         # salary (guard against dates)
-        salary_pat = r'\$?(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s*(?:k|K|thousand)?\s*(?:-|to)\s*\$?(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s*(?:k|K|thousand)?\s*(?:per\s+)?(year|annual|hour|month)?'
-        sm = re.search(salary_pat, text, re.IGNORECASE)
+        sm = _SALARY_RE.search(text)
         if sm:
             raw = sm.group(0)
             has_hint = (
                 ("$" in raw)
                 or ("usd" in raw.lower())
                 or ("k" in raw.lower())
-                or re.search(r"\b(per|hour|year|annual|month|salary|compensation|pay)\b", raw, re.IGNORECASE)
+                or _SALARY_HINT_RE.search(raw)
             )
             if has_hint:
                 try:
@@ -464,11 +521,13 @@ class SimpleJobExtractor:
     def _normalize_date(self, date_str: str) -> Optional[str]:
         if not date_str:
             return None
-        for fmt in ("%Y-%m-%d", "%m/%d/%Y", "%d-%m-%Y", "%B %d, %Y"):
-            try:
-                return datetime.strptime(date_str.strip(), fmt).date().isoformat()
-            except Exception:
-                continue
+        s = date_str.strip()
+        for pat, fmt in _DATE_DISPATCH:
+            if pat.match(s):
+                try:
+                    return datetime.strptime(s, fmt).date().isoformat()
+                except ValueError:
+                    return None
         return None
 
     def _validate_and_repair(self, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -4,18 +4,280 @@ Free alternatives to paid scraping services using open-source tools.
 from __future__ import annotations
 
 import asyncio
+import http.cookiejar
+import ipaddress
 import os
 import random
+import re
+import socket
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from typing import Tuple, Optional, Dict, Any
 import logging
 
+import httpcore
+import httpx
+from cachetools import LRUCache, TTLCache
+
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+try:
+    from curl_cffi.requests import AsyncSession as _CurlAsyncSession
+except ImportError:
+    _CurlAsyncSession = None
+
 logger = logging.getLogger(__name__)
 
+_UA_POOL = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36",
+)
+
+# Session-like headers that persist across requests (User-Agent is set per request)
+_BASE_HEADERS = {
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": "gzip, deflate, br",
+    "DNT": "1",
+    "Connection": "keep-alive",
+    "Upgrade-Insecure-Requests": "1",
+    "Sec-Fetch-Dest": "document",
+    "Sec-Fetch-Mode": "navigate",
+    "Sec-Fetch-Site": "none",
+    "Sec-Fetch-User": "?1",
+}
+
+# Long-lived pooled client so repeat fetches reuse TCP/TLS connections
+_CLIENT: Optional[httpx.AsyncClient] = None
+
+# In-process libcurl session (curl_cffi) used instead of forking curl when available
+_CURL_SESSION = None
+
+# netloc -> cookies gathered on earlier visits; hosts present here skip the warmup GET
+_session_cookies: LRUCache = LRUCache(maxsize=512)
+
+
+# host -> resolved addresses in resolver order, so new connections to a known host skip the resolver
+_DNS_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=300)
+
+
+async def _resolve(host: str, port: int) -> Tuple[str, ...]:
+    addrs = _DNS_CACHE.get(host)
+    if addrs is not None:
+        return addrs
+    infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    addrs = tuple(dict.fromkeys(info[4][0] for info in infos))
+    _DNS_CACHE[host] = addrs
+    return addrs
+
+
+class _CachingDNSBackend(httpcore.AsyncNetworkBackend):
+    """Network backend that resolves hostnames through _DNS_CACHE.
+
+    Each cached address is tried in turn, like the resolver fallback the inner
+    backend does for a hostname. TLS still uses the original hostname for
+    SNI/verification, since httpcore passes the request origin to start_tls separately.
+    """
+
+    def __init__(self, inner: httpcore.AsyncNetworkBackend) -> None:
+        self._inner = inner
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        try:
+            ipaddress.ip_address(host)
+        except ValueError:
+            pass
+        else:
+            return await self._inner.connect_tcp(
+                host, port, timeout=timeout, local_address=local_address, socket_options=socket_options
+            )
+        try:
+            addrs = await _resolve(host, port)
+        except OSError as e:
+            raise httpcore.ConnectError(str(e)) from e
+        for i, addr in enumerate(addrs):
+            try:
+                stream = await self._inner.connect_tcp(
+                    addr, port, timeout=timeout, local_address=local_address, socket_options=socket_options
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout):
+                if i == len(addrs) - 1:
+                    # Every cached address failed; it may be stale, so resolve afresh next time
+                    _DNS_CACHE.pop(host, None)
+                    raise
+                continue
+            if i:
+                # Lead with the address that answered so later connections skip the dead ones
+                _DNS_CACHE[host] = addrs[i:] + addrs[:i]
+            return stream
+        raise httpcore.ConnectError(f"No addresses resolved for {host}")
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self._inner.connect_unix_socket(path, timeout=timeout, socket_options=socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        await self._inner.sleep(seconds)
+
+
+def _build_transport(proxy: Optional[str] = None) -> httpx.AsyncHTTPTransport:
+    transport = httpx.AsyncHTTPTransport(
+        proxy=proxy,
+        http2=_HTTP2,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+    )
+    # Direct connections resolve the target host themselves; route that through the cache
+    # (the proxy resolves targets for proxied requests). httpx has no public hook for the
+    # network backend, so this relies on httpcore 1.x internals (pinned in pyproject) and
+    # is skipped if they ever move.
+    pool = getattr(transport, "_pool", None)
+    if not proxy and hasattr(pool, "_network_backend"):
+        pool._network_backend = _CachingDNSBackend(pool._network_backend)
+    return transport
+
+
+def _build_client(proxy: Optional[str] = None) -> httpx.AsyncClient:
+    # Clients can serve many hosts, so their jars refuse all cookies; per-host cookies
+    # live in _session_cookies and are attached hop by hop in _get_with_cookies
+    no_store = http.cookiejar.CookieJar(policy=http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+    return httpx.AsyncClient(
+        headers=_BASE_HEADERS,
+        cookies=no_store,
+        transport=_build_transport(proxy),
+        timeout=25.0,
+        follow_redirects=True,
+    )
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _CLIENT
+    if _CLIENT is None or _CLIENT.is_closed:
+        _CLIENT = _build_client()
+    return _CLIENT
+
+
+async def _get_with_cookies(
+    client: httpx.AsyncClient, url: str, headers: Dict[str, str], cookies: httpx.Cookies
+) -> httpx.Response:
+    """GET ``url`` following redirects by hand, keeping ``cookies`` as the session jar.
+
+    httpx drops an explicit Cookie header on every redirect and the client's own jar
+    stores nothing, so each hop's Set-Cookie is merged into ``cookies`` and the jar's
+    matching cookies are attached to the next hop.
+    """
+    request = client.build_request("GET", url, headers=headers)
+    for _ in range(client.max_redirects + 1):
+        cookies.set_cookie_header(request)
+        resp = await client.send(request, follow_redirects=False)
+        cookies.extract_cookies(resp)
+        if resp.next_request is None:
+            return resp
+        request = resp.next_request
+    raise httpx.TooManyRedirects("Exceeded maximum allowed redirects.", request=request)
+
+
+def _get_curl_session():
+    global _CURL_SESSION
+    if _CURL_SESSION is None:
+        _CURL_SESSION = _CurlAsyncSession(impersonate="chrome124", timeout=30)
+    return _CURL_SESSION
+
+
+async def aclose_client() -> None:
+    """Close the shared HTTP clients (call on application shutdown)."""
+    global _CLIENT, _CURL_SESSION
+    if _CLIENT is not None:
+        await _CLIENT.aclose()
+        _CLIENT = None
+    if _CURL_SESSION is not None:
+        await _CURL_SESSION.close()
+        _CURL_SESSION = None
+
+
+# Substrings that mark a challenge/interstitial page rather than real content
+BLOCK_INDICATORS = (
+    "captcha", "are you a robot", "access denied", "blocked",
+    "cloudflare", "checking your browser",
+)
+
+# All indicators folded into one case-insensitive pattern: one scan, no lowercased copy
+_BLOCK_RE = re.compile("|".join(map(re.escape, BLOCK_INDICATORS)), re.IGNORECASE)
+
+# Default overall budget for fetch_antibot_free; the fast-method race gets the whole budget,
+# matching the per-method client timeouts (httpx 25s, curl 30s)
+DEFAULT_FETCH_TIMEOUT = 30.0
+
+# Only page_source is used, so skip images, stylesheets and fonts in Chrome. Images have a
+# content setting; CSS and fonts do not, so those are blocked by URL through CDP instead.
+_CHROME_CONTENT_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+}
+_CHROME_BLOCKED_URLS = [
+    f"*.{ext}{suffix}" for ext in ("css", "woff", "woff2", "ttf", "otf") for suffix in ("", "?*")
+]
+
+
+def _block_static_assets(driver) -> None:
+    """Block stylesheet and font requests for the driver's session (best-effort)"""
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": _CHROME_BLOCKED_URLS})
+    except Exception as e:
+        logger.debug(f"Could not block static assets via CDP: {e}")
+
+# Dedicated pool for blocking browser calls so they never stall the event loop
+_BROWSER_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="selenium")
+
+
+async def _run_blocking(executor: ThreadPoolExecutor, fn, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, fn, *args)
+
+# Fixed Chrome flags shared by the Selenium and undetected-chrome launchers
+_CHROME_BASE_ARGS = (
+    "--headless=new",
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--blink-settings=imagesEnabled=false",
+)
+
+_CURL_BASE_CMD = (
+    "curl", "-s", "-L", "--compressed",
+    "-H", "Accept: text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "-H", "Accept-Language: en-US,en;q=0.9",
+    "-H", "User-Agent: Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36",
+    "--max-time", "30",
+    "--retry", "2",
+)
+
+# Recent successful fetches; duplicate requests within the TTL skip the whole ladder
+_RESP_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=60)
+
+# Persistent browsers are recycled after this many fetches to bound memory growth
+MAX_DRIVER_USES = 100
+
+
+def _is_blocked(html: str) -> bool:
+    return _BLOCK_RE.search(html) is not None
+
+
 class FreeScrapingAlternatives:
     def __init__(self):
         self.selenium_available = self._check_selenium()
         self.undetected_chrome_available = self._check_undetected_chrome()
+        # One long-lived browser per kind ("selenium" / "undetected_chrome"),
+        # each guarded by a lock so only one fetch drives it at a time
+        self._drivers: Dict[str, Any] = {}
+        self._driver_uses: Dict[str, int] = {}
+        self._driver_locks = {"selenium": asyncio.Lock(), "undetected_chrome": asyncio.Lock()}
+        # chromedriver_autoinstaller only needs to run once per process
+        self._driver_installed = False
+        self._install_lock = asyncio.Lock()
 
     def _check_selenium(self) -> bool:
         """Check if Selenium is available"""
@@ -35,202 +297,223 @@ class FreeScrapingAlternatives:
             logger.warning("undetected-chromedriver not available. Install with: pip install undetected-chromedriver")
             return False
 
+    async def _ensure_driver(self) -> None:
+        """Install/verify ChromeDriver once per process"""
+        async with self._install_lock:
+            if self._driver_installed:
+                return
+            import chromedriver_autoinstaller
+            await _run_blocking(_BROWSER_EXECUTOR, chromedriver_autoinstaller.install)
+            self._driver_installed = True
+
+    def _new_selenium_driver(self):
+        """Launch headless Chrome via Selenium"""
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+
+        # Configure Chrome options for stealth
+        chrome_options = Options()
+        for arg in _CHROME_BASE_ARGS:
+            chrome_options.add_argument(arg)
+        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        chrome_options.add_experimental_option('useAutomationExtension', False)
+        chrome_options.add_experimental_option("prefs", _CHROME_CONTENT_PREFS)
+        # Return from driver.get at DOMContentLoaded rather than full load
+        chrome_options.page_load_strategy = "eager"
+
+        # Randomize window size
+        width = random.randint(1200, 1920)
+        height = random.randint(800, 1080)
+        chrome_options.add_argument(f"--window-size={width},{height}")
+
+        # Random user agent
+        chrome_options.add_argument(f"--user-agent={random.choice(_UA_POOL)}")
+
+        driver = webdriver.Chrome(options=chrome_options)
+        _block_static_assets(driver)
+        return driver
+
+    def _new_undetected_driver(self):
+        """Launch headless undetected-chromedriver"""
+        import undetected_chromedriver as uc
+
+        # Configure undetected Chrome
+        options = uc.ChromeOptions()
+        for arg in _CHROME_BASE_ARGS:
+            options.add_argument(arg)
+        options.add_experimental_option("prefs", _CHROME_CONTENT_PREFS)
+        options.page_load_strategy = "eager"
+
+        # Randomize window size
+        width = random.randint(1200, 1920)
+        height = random.randint(800, 1080)
+        options.add_argument(f"--window-size={width},{height}")
+
+        driver = uc.Chrome(options=options, version_main=None)
+        _block_static_assets(driver)
+        return driver
+
+    def _get_driver(self, kind: str, factory):
+        """Return the persistent driver for ``kind``, launching or recycling it as needed"""
+        driver = self._drivers.get(kind)
+        if driver is not None and self._driver_uses.get(kind, 0) >= MAX_DRIVER_USES:
+            self._discard_driver(kind)
+            driver = None
+        if driver is None:
+            driver = factory()
+            self._drivers[kind] = driver
+            self._driver_uses[kind] = 0
+        else:
+            # Isolate state left over from the previous fetch
+            driver.delete_all_cookies()
+            driver.get("about:blank")
+        self._driver_uses[kind] += 1
+        return driver
+
+    def _discard_driver(self, kind: str) -> None:
+        driver = self._drivers.pop(kind, None)
+        self._driver_uses.pop(kind, None)
+        if driver is not None:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    def quit_drivers(self) -> None:
+        """Shut down any persistent browsers"""
+        for kind in list(self._drivers):
+            self._discard_driver(kind)
+
+    def _load_page(self, driver, url: str, timeout: float) -> None:
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        driver.get(url)
+        # Wait for the DOM to be parsed (matches the "eager" page load strategy)
+        WebDriverWait(driver, timeout).until(
+            lambda d: d.execute_script("return document.readyState") in ("interactive", "complete")
+        )
+
     async def fetch_with_selenium(self, url: str, timeout: float = 30.0) -> Tuple[str, int]:
-        """Fetch using Selenium with Chrome in headless mode and auto ChromeDriver management"""
+        """Fetch using a persistent headless Chrome driven by Selenium"""
         if not self.selenium_available:
             return "", 0
 
-        try:
-            import chromedriver_autoinstaller
-            chromedriver_autoinstaller.install()
-            from selenium import webdriver
-            from selenium.webdriver.chrome.options import Options
-            from selenium.webdriver.common.by import By
-            from selenium.webdriver.support.ui import WebDriverWait
-            from selenium.webdriver.support import expected_conditions as EC
-            from selenium.common.exceptions import TimeoutException
-
-            # Configure Chrome options for stealth
-            chrome_options = Options()
-            chrome_options.add_argument("--headless=new")
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            chrome_options.add_experimental_option('useAutomationExtension', False)
-
-            # Randomize window size
-            width = random.randint(1200, 1920)
-            height = random.randint(800, 1080)
-            chrome_options.add_argument(f"--window-size={width},{height}")
-
-            # Random user agent
-            user_agents = [
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36",
-                "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36",
-                "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36",
-            ]
-            chrome_options.add_argument(f"--user-agent={random.choice(user_agents)}")
-
-            # Create driver
-            driver = webdriver.Chrome(options=chrome_options)
-
+        async with self._driver_locks["selenium"]:
             try:
-                # Execute stealth script
-                driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-
-                # Navigate to URL
-                driver.get(url)
+                await self._ensure_driver()
+                driver = await _run_blocking(_BROWSER_EXECUTOR, self._get_driver, "selenium", self._new_selenium_driver)
 
-                # Wait for page to load
-                WebDriverWait(driver, timeout).until(
-                    lambda d: d.execute_script("return document.readyState") == "complete"
+                # Execute stealth script
+                await _run_blocking(
+                    _BROWSER_EXECUTOR,
+                    driver.execute_script,
+                    "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})",
                 )
 
-                # Additional wait for dynamic content
-                await asyncio.sleep(2)
+                await _run_blocking(_BROWSER_EXECUTOR, self._load_page, driver, url, timeout)
+
+                # Brief wait for dynamic content
+                await asyncio.sleep(0.5)
 
                 # Get page source
-                html = driver.page_source
+                html = await _run_blocking(_BROWSER_EXECUTOR, lambda: driver.page_source)
                 return html, 200
 
-            finally:
-                driver.quit()
-
-        except Exception as e:
-            logger.error(f"Selenium fetch failed for {url}: {e}")
-            return "", 0
+            except Exception as e:
+                logger.error(f"Selenium fetch failed for {url}: {e}")
+                # The browser may be wedged; start fresh next time
+                await _run_blocking(_BROWSER_EXECUTOR, self._discard_driver, "selenium")
+                return "", 0
 
     async def fetch_with_undetected_chrome(self, url: str, timeout: float = 30.0) -> Tuple[str, int]:
-        """Fetch using undetected-chromedriver for maximum stealth"""
+        """Fetch using a persistent undetected-chromedriver for maximum stealth"""
         if not self.undetected_chrome_available:
             return await self.fetch_with_selenium(url, timeout)
 
-        try:
-            import undetected_chromedriver as uc
-            from selenium.webdriver.common.by import By
-            from selenium.webdriver.support.ui import WebDriverWait
-            from selenium.webdriver.support import expected_conditions as EC
-
-            # Configure undetected Chrome
-            options = uc.ChromeOptions()
-            options.add_argument("--headless=new")
-            options.add_argument("--no-sandbox")
-            options.add_argument("--disable-dev-shm-usage")
-            options.add_argument("--disable-gpu")
-            
-            # Randomize window size
-            width = random.randint(1200, 1920)
-            height = random.randint(800, 1080)
-            options.add_argument(f"--window-size={width},{height}")
-
-            # Create undetected Chrome driver
-            driver = uc.Chrome(options=options, version_main=None)
-            
+        async with self._driver_locks["undetected_chrome"]:
             try:
-                # Navigate to URL
-                driver.get(url)
-                
-                # Wait for page to load
-                WebDriverWait(driver, timeout).until(
-                    lambda d: d.execute_script("return document.readyState") == "complete"
+                driver = await _run_blocking(
+                    _BROWSER_EXECUTOR, self._get_driver, "undetected_chrome", self._new_undetected_driver
                 )
-                
-                # Additional wait for dynamic content
-                await asyncio.sleep(3)
-                
+
+                await _run_blocking(_BROWSER_EXECUTOR, self._load_page, driver, url, timeout)
+
+                # Brief wait for dynamic content
+                await asyncio.sleep(0.5)
+
                 # Get page source
-                html = driver.page_source
+                html = await _run_blocking(_BROWSER_EXECUTOR, lambda: driver.page_source)
                 return html, 200
-                
-            finally:
-                driver.quit()
-                
-        except Exception as e:
-            logger.error(f"Undetected Chrome fetch failed for {url}: {e}")
-            return await self.fetch_with_selenium(url, timeout)
+
+            except Exception as e:
+                logger.error(f"Undetected Chrome fetch failed for {url}: {e}")
+                await _run_blocking(_BROWSER_EXECUTOR, self._discard_driver, "undetected_chrome")
+
+        return await self.fetch_with_selenium(url, timeout)
 
     async def fetch_with_requests_session(self, url: str, proxy: Optional[str] = None) -> Tuple[str, int]:
         """Enhanced requests session with session persistence and cookies"""
-        import httpx
-        
-        # Create session-like headers that persist across requests
-        headers = {
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.9",
-            "Accept-Encoding": "gzip, deflate, br",
-            "DNT": "1",
-            "Connection": "keep-alive",
-            "Upgrade-Insecure-Requests": "1",
-            "Sec-Fetch-Dest": "document",
-            "Sec-Fetch-Mode": "navigate",
-            "Sec-Fetch-Site": "none",
-            "Sec-Fetch-User": "?1",
-            "User-Agent": random.choice([
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36",
-                "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36",
-                "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36",
-            ])
-        }
+        from urllib.parse import urlparse
 
-        proxies = {"all://": proxy} if proxy else None
+        headers = {"User-Agent": random.choice(_UA_POOL)}
+        parsed = urlparse(url)
+        cookies = _session_cookies.get(parsed.netloc)
+        # Proxies are bound per transport in httpx, so proxied fetches get their own client
+        client = _build_client(proxy) if proxy else _get_client()
 
         try:
-            async with httpx.AsyncClient(
-                headers=headers,
-                proxies=proxies,
-                timeout=25.0,
-                follow_redirects=True,
-                http2=True,
-                cookies={}  # Session cookies will be handled automatically
-            ) as client:
-                # First, visit the main domain to establish session
-                from urllib.parse import urlparse
-                parsed = urlparse(url)
-                base_url = f"{parsed.scheme}://{parsed.netloc}"
-                
+            if cookies is None:
+                # First visit to this host: hit the main domain to establish session cookies
+                cookies = httpx.Cookies()
                 try:
-                    await client.get(base_url)
-                    await asyncio.sleep(1)  # Brief pause
-                except:
+                    await _get_with_cookies(client, f"{parsed.scheme}://{parsed.netloc}", headers, cookies)
+                except Exception:
                     pass  # Ignore errors on base URL
-                
-                # Now fetch the actual URL
-                resp = await client.get(url)
-                return resp.text, resp.status_code
-                
+
+            # Now fetch the actual URL
+            resp = await _get_with_cookies(client, url, headers, cookies)
+            _session_cookies[parsed.netloc] = cookies
+            return resp.text, resp.status_code
+
         except Exception as e:
             logger.error(f"Enhanced requests session failed for {url}: {e}")
             return "", 0
+        finally:
+            if proxy:
+                await client.aclose()
 
     async def fetch_with_curl_subprocess(self, url: str, proxy: Optional[str] = None) -> Tuple[str, int]:
-        """Use curl subprocess as fallback method"""
+        """Use libcurl (curl_cffi, Chrome TLS fingerprint) or a curl subprocess as fallback method"""
+        if _CurlAsyncSession is not None:
+            try:
+                proxies = {"http": proxy, "https": proxy} if proxy else None
+                resp = await _get_curl_session().get(url, proxies=proxies)
+                return resp.text, resp.status_code
+            except Exception as e:
+                logger.error(f"curl_cffi fetch failed for {url}: {e}")
+                return "", 0
+
         try:
-            import subprocess
+            cmd = [*_CURL_BASE_CMD, "--proxy", proxy, url] if proxy else [*_CURL_BASE_CMD, url]
             
-            cmd = [
-                "curl", "-s", "-L", "--compressed",
-                "-H", "Accept: text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-                "-H", "Accept-Language: en-US,en;q=0.9",
-                "-H", "User-Agent: Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36",
-                "--max-time", "30",
-                "--retry", "2",
-            ]
-            
-            if proxy:
-                cmd.extend(["--proxy", proxy])
-            
-            cmd.append(url)
-            
-            # Run curl
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=35)
+            # Run curl as an asyncio subprocess so a cancelled race (or timeout) kills it
+            # instead of leaving a thread blocked on it
+            proc = await asyncio.create_subprocess_exec(
+                *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=35)
+            finally:
+                if proc.returncode is None:
+                    proc.kill()
+                    await proc.wait()
             
-            if result.returncode == 0:
-                return result.stdout, 200
+            if proc.returncode == 0:
+                return stdout.decode(errors="replace"), 200
             else:
-                logger.warning(f"Curl failed for {url}: {result.stderr}")
-                return "", result.returncode
+                logger.warning(f"Curl failed for {url}: {stderr.decode(errors='replace')}")
+                return "", proc.returncode
                 
         except Exception as e:
             logger.error(f"Curl subprocess failed for {url}: {e}")
@@ -242,50 +525,89 @@ class FreeAntiBot:
     def __init__(self):
         self.scraping_alternatives = FreeScrapingAlternatives()
         
-    async def fetch_antibot_free(self, url: str) -> Tuple[str, int]:
+    async def fetch_antibot_free(self, url: str, timeout: float = DEFAULT_FETCH_TIMEOUT) -> Tuple[str, int]:
+        """Fetch ``url`` via the anti-bot ladder, serving recent successes from cache."""
+        cached = _RESP_CACHE.get(url)
+        if cached is not None:
+            return cached
+        html, status = await self._fetch_antibot_free(url, timeout)
+        # Only successful, unblocked pages are cached so failures are retried
+        if html and status == 200:
+            _RESP_CACHE[url] = (html, status)
+        return html, status
+
+    async def _fetch_antibot_free(self, url: str, timeout: float) -> Tuple[str, int]:
         """
-        Try multiple free anti-bot techniques in order of effectiveness:
-        1. Undetected Chrome (best for bypassing detection)
-        2. Regular Selenium (good for JS-heavy sites)  
-        3. Enhanced requests session (fastest)
-        4. Curl subprocess (most basic fallback)
+        Try free anti-bot techniques in two phases:
+        1. Race the cheap methods (enhanced requests session, curl) concurrently
+           and take the first unblocked 200 response, waiting at most ``timeout``.
+        2. Only if both fail, fall back to the heavy browsers in order:
+           undetected Chrome, then regular Selenium.
         """
-        
-        methods = [
-            ("undetected_chrome", self.scraping_alternatives.fetch_with_undetected_chrome),
-            ("selenium", self.scraping_alternatives.fetch_with_selenium),
-            ("requests_session", self.scraping_alternatives.fetch_with_requests_session),
-            ("curl", self.scraping_alternatives.fetch_with_curl_subprocess),
+        alt = self.scraping_alternatives
+
+        fast_methods = {
+            "requests_session": alt.fetch_with_requests_session,
+            "curl": alt.fetch_with_curl_subprocess,
+        }
+        tasks = {
+            asyncio.create_task(method(url)): name
+            for name, method in fast_methods.items()
+        }
+        try:
+            for fut in asyncio.as_completed(tasks, timeout=timeout):
+                try:
+                    html, status = await fut
+                except asyncio.TimeoutError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"Fast fetch failed for {url}: {e}")
+                    continue
+                if html and status == 200 and not _is_blocked(html):
+                    logger.info(f"Successfully fetched {url} using a fast method")
+                    return html, status
+                logger.warning(f"Fast fetch for {url} returned status {status} or blocked content")
+        except asyncio.TimeoutError:
+            logger.warning(f"Fast methods timed out for {url}")
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+        slow_methods = [
+            ("undetected_chrome", alt.fetch_with_undetected_chrome),
+            ("selenium", alt.fetch_with_selenium),
         ]
-        
-        for method_name, method in methods:
+        for method_name, method in slow_methods:
             try:
                 logger.info(f"Trying {method_name} for {url}")
-                html, status = await method(url)
-                
-                if html and status == 200:
-                    # Quick check for block indicators
-                    html_lower = html.lower()
-                    block_indicators = [
-                        "captcha", "are you a robot", "access denied", "blocked",
-                        "cloudflare", "checking your browser"
-                    ]
-                    
-                    if not any(indicator in html_lower for indicator in block_indicators):
-                        logger.info(f"Successfully fetched {url} using {method_name}")
-                        return html, status
-                
+                html, status = await method(url, timeout)
+
+                if html and status == 200 and not _is_blocked(html):
+                    logger.info(f"Successfully fetched {url} using {method_name}")
+                    return html, status
+
                 logger.warning(f"{method_name} for {url} returned status {status} or blocked content")
-                
+
             except Exception as e:
                 logger.warning(f"{method_name} failed for {url}: {e}")
                 continue
-        
+
         return "", 0
 
 # Global instance
 _free_antibot = FreeAntiBot()
 
-async def fetch_html_antibot_free(url: str) -> Tuple[str, int]:
+async def fetch_html_antibot_free(url: str, timeout: float = DEFAULT_FETCH_TIMEOUT) -> Tuple[str, int]:
     """Free alternative to paid anti-bot services"""
-    return await _free_antibot.fetch_antibot_free(url)
\ No newline at end of file
+    return await _free_antibot.fetch_antibot_free(url, timeout)
+
+
+def get_scraping_alternatives() -> FreeScrapingAlternatives:
+    """Shared scraping alternatives so persistent browsers are reused process-wide"""
+    return _free_antibot.scraping_alternatives
+
+
+def shutdown_browsers() -> None:
+    """Quit the persistent browsers held by the global instance"""
+    _free_antibot.scraping_alternatives.quit_drivers()
\ No newline at end of file
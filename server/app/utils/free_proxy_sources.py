@@ -4,13 +4,52 @@ Free proxy sources that don't require API keys.
 from __future__ import annotations
 
 import asyncio
+import itertools
 import random
+import re
+import time
 import logging
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional, Set
 import httpx
 
 logger = logging.getLogger(__name__)
 
+# ip:port with octets 0-255 and port 1-65535, matched in a single anchored pass
+_PROXY_RE = re.compile(
+    r"(25[0-5]|2[0-4]\d|1?\d?\d)(\.(25[0-5]|2[0-4]\d|1?\d?\d)){3}"
+    r":([1-9]\d{0,3}|[1-5]\d{4}|6[0-4]\d{3}|65[0-4]\d{2}|655[0-2]\d|6553[0-5])",
+    re.ASCII,
+)
+# Same pattern applied line-wise over a whole proxy-list body in one scan
+_PROXY_LINE_RE = re.compile(rf"^[ \t]*({_PROXY_RE.pattern})[ \t\r]*$", re.ASCII | re.MULTILINE)
+
+# Tiny endpoints answering 204 with no body; probed in parallel to mask a slow one
+_PROXY_HEALTH_URLS = (
+    "http://www.gstatic.com/generate_204",
+    "http://clients3.google.com/generate_204",
+)
+
+# Shared client for the proxy-list sources; amortizes TLS setup across fetches
+_CLIENT: Optional[httpx.AsyncClient] = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _CLIENT
+    if _CLIENT is None or _CLIENT.is_closed:
+        _CLIENT = httpx.AsyncClient(
+            timeout=10.0,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+    return _CLIENT
+
+
+async def aclose_client() -> None:
+    """Close the shared HTTP client (call on application shutdown)."""
+    global _CLIENT
+    if _CLIENT is not None:
+        await _CLIENT.aclose()
+        _CLIENT = None
+
 class FreeProxySources:
     """Aggregates free proxy sources without requiring API keys"""
     
@@ -23,90 +62,62 @@ class FreeProxySources:
             self._fetch_from_freeproxyworld,
         ]
 
-    async def fetch_all_proxies(self) -> List[Dict[str, str]]:
-        """Fetch proxies from all available sources"""
+    async def fetch_all_proxies(self) -> List[str]:
+        """Fetch proxy URLs from all available sources"""
         all_proxies = []
-        
-        for source in self.sources:
-            try:
-                proxies = await source()
-                all_proxies.extend(proxies)
-                logger.info(f"Fetched {len(proxies)} proxies from {source.__name__}")
-            except Exception as e:
-                logger.warning(f"Failed to fetch from {source.__name__}: {e}")
+        # Shared across sources so duplicates are dropped as they are ingested
+        seen: Set[str] = set()
+
+        # Sources live on independent hosts, so fetch them concurrently
+        results = await asyncio.gather(*(source(seen) for source in self.sources), return_exceptions=True)
+        for source, proxies in zip(self.sources, results):
+            if isinstance(proxies, BaseException):
+                logger.warning(f"Failed to fetch from {source.__name__}: {proxies}")
                 continue
-        
-        # Remove duplicates
-        seen = set()
-        unique_proxies = []
-        for proxy in all_proxies:
-            proxy_url = list(proxy.values())[0]  # Get the proxy URL
-            if proxy_url not in seen:
-                seen.add(proxy_url)
-                unique_proxies.append(proxy)
-        
-        logger.info(f"Total unique proxies found: {len(unique_proxies)}")
-        random.shuffle(unique_proxies)
-        return unique_proxies[:100]  # Limit to 100 best proxies
+            all_proxies.extend(proxies)
+            logger.info(f"Fetched {len(proxies)} proxies from {source.__name__}")
 
-    async def _fetch_from_github_1(self) -> List[Dict[str, str]]:
+        logger.info(f"Total unique proxies found: {len(all_proxies)}")
+        random.shuffle(all_proxies)
+        return all_proxies[:100]  # Limit to 100 best proxies
+
+    async def _fetch_from_github_1(self, seen: Set[str]) -> List[str]:
         """Fetch from TheSpeedX/PROXY-List repository"""
-        proxies = []
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                resp = await client.get("https://raw.githubusercontent.com/TheSpeedX/PROXY-List/master/http.txt")
-                if resp.status_code == 200:
-                    for line in resp.text.strip().split('\n'):
-                        if self._is_valid_proxy_line(line):
-                            proxies.append(self._format_proxy(line))
+            return await self._stream_proxy_list("https://raw.githubusercontent.com/TheSpeedX/PROXY-List/master/http.txt", seen)
         except Exception as e:
             logger.warning(f"GitHub source 1 failed: {e}")
-        return proxies
+            return []
 
-    async def _fetch_from_github_2(self) -> List[Dict[str, str]]:
+    async def _fetch_from_github_2(self, seen: Set[str]) -> List[str]:
         """Fetch from clarketm/proxy-list repository"""
-        proxies = []
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                resp = await client.get("https://raw.githubusercontent.com/clarketm/proxy-list/master/proxy-list-raw.txt")
-                if resp.status_code == 200:
-                    for line in resp.text.strip().split('\n'):
-                        if self._is_valid_proxy_line(line):
-                            proxies.append(self._format_proxy(line))
+            return await self._stream_proxy_list("https://raw.githubusercontent.com/clarketm/proxy-list/master/proxy-list-raw.txt", seen)
         except Exception as e:
             logger.warning(f"GitHub source 2 failed: {e}")
-        return proxies
+            return []
 
-    async def _fetch_from_github_3(self) -> List[Dict[str, str]]:
+    async def _fetch_from_github_3(self, seen: Set[str]) -> List[str]:
         """Fetch from proxy4parsing/proxy-list repository"""
-        proxies = []
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                resp = await client.get("https://raw.githubusercontent.com/proxy4parsing/proxy-list/main/http.txt")
-                if resp.status_code == 200:
-                    for line in resp.text.strip().split('\n'):
-                        if self._is_valid_proxy_line(line):
-                            proxies.append(self._format_proxy(line))
+            return await self._stream_proxy_list("https://raw.githubusercontent.com/proxy4parsing/proxy-list/main/http.txt", seen)
         except Exception as e:
             logger.warning(f"GitHub source 3 failed: {e}")
-        return proxies
+            return []
 
-    async def _fetch_from_pubproxy(self) -> List[Dict[str, str]]:
+    async def _fetch_from_pubproxy(self, seen: Set[str]) -> List[str]:
         """Fetch from pubproxy.com free API"""
         proxies = []
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                # PubProxy free API - no key required, limited to 50 requests/day
-                resp = await client.get("http://pubproxy.com/api/proxy?limit=20&format=txt&type=http")
-                if resp.status_code == 200:
-                    for line in resp.text.strip().split('\n'):
-                        if self._is_valid_proxy_line(line):
-                            proxies.append(self._format_proxy(line))
+            # PubProxy free API - no key required, limited to 50 requests/day
+            resp = await _get_client().get("http://pubproxy.com/api/proxy?limit=20&format=txt&type=http")
+            if resp.status_code == 200:
+                proxies = self._parse_proxy_batch(resp.text, seen)
         except Exception as e:
             logger.warning(f"PubProxy source failed: {e}")
         return proxies
 
-    async def _fetch_from_freeproxyworld(self) -> List[Dict[str, str]]:
+    async def _fetch_from_freeproxyworld(self, seen: Set[str]) -> List[str]:
         """Scrape proxies from free proxy world (fallback)"""
         proxies = []
         try:
@@ -119,52 +130,59 @@ class FreeProxySources:
 
     def _is_valid_proxy_line(self, line: str) -> bool:
         """Validate proxy line format"""
-        if not line or not line.strip():
-            return False
-        
-        line = line.strip()
-        if ':' not in line:
-            return False
-        
-        try:
-            ip, port = line.split(':', 1)
-            # Basic IP validation
-            parts = ip.split('.')
-            if len(parts) != 4:
-                return False
-            for part in parts:
-                if not (0 <= int(part) <= 255):
-                    return False
-            # Port validation
-            port_int = int(port)
-            if not (1 <= port_int <= 65535):
-                return False
-            return True
-        except (ValueError, AttributeError):
+        if not line:
             return False
+        return _PROXY_RE.fullmatch(line.strip()) is not None
+
+    async def _stream_proxy_list(self, url: str, seen: Set[str]) -> List[str]:
+        """Stream a plain-text proxy list line by line, validating and deduping as it arrives"""
+        proxies: List[str] = []
+        async with _get_client().stream("GET", url) as resp:
+            if resp.status_code != 200:
+                return proxies
+            async for line in resp.aiter_lines():
+                line = line.strip()
+                if not line or line in seen:
+                    continue
+                seen.add(line)
+                if _PROXY_RE.fullmatch(line):
+                    proxies.append(self._format_proxy(line))
+        return proxies
+
+    def _parse_proxy_batch(self, text: str, seen: Optional[Set[str]] = None) -> List[str]:
+        """Extract every new valid ip:port line from a proxy-list body in one regex scan"""
+        if seen is None:
+            seen = set()
+        proxies = []
+        for m in _PROXY_LINE_RE.finditer(text):
+            line = m.group(1)
+            if line not in seen:
+                seen.add(line)
+                proxies.append(self._format_proxy(line))
+        return proxies
+
+    def _format_proxy(self, proxy_line: str) -> str:
+        """Format proxy line into a proxy URL"""
+        return f'http://{proxy_line.strip()}'
+
 
-    def _format_proxy(self, proxy_line: str) -> Dict[str, str]:
-        """Format proxy line into httpx proxy dict"""
-        return {
-            'http://': f'http://{proxy_line.strip()}',
-            'https://': f'http://{proxy_line.strip()}'
-        }
+def as_httpx_proxies(proxy_url: str) -> Dict[str, str]:
+    """Build the httpx-style proxies mapping for a proxy URL"""
+    return {'http://': proxy_url, 'https://': proxy_url}
 
 # Enhanced proxy rotator that uses free sources
 class EnhancedFreeProxyRotator:
     def __init__(self):
         self.proxy_sources = FreeProxySources()
-        self.proxies: List[Dict[str, str]] = []
-        self.current_index = 0
-        self.last_updated = 0
+        self.proxies: List[str] = []
+        self._cycle: Iterator[str] = iter(())
+        self.last_updated = 0.0  # time.monotonic() of the last refresh
         self.update_interval = 1800  # 30 minutes
         self.test_timeout = 3.0  # Faster testing
 
     async def update_proxies(self):
         """Update proxy list from free sources"""
-        import time
-        
-        if time.time() - self.last_updated < self.update_interval and self.proxies:
+        if time.monotonic() - self.last_updated < self.update_interval and self.proxies:
             return
 
         logger.info("Updating proxy list from free sources...")
@@ -174,6 +192,17 @@ class EnhancedFreeProxyRotator:
             logger.warning("No proxies fetched from any source")
             return
         
+        # Cheap triage first: drop proxies that don't even accept a TCP connection
+        tcp_semaphore = asyncio.Semaphore(200)
+
+        async def tcp_check(proxy):
+            host, _, port = proxy.partition('://')[2].rpartition(':')
+            async with tcp_semaphore:
+                return proxy if await self._tcp_alive(host, int(port)) else None
+
+        logger.info(f"TCP-checking {len(raw_proxies)} proxies...")
+        reachable = [p for p in await asyncio.gather(*(tcp_check(p) for p in raw_proxies)) if p]
+
         # Test proxies concurrently with higher concurrency for speed
         working_proxies = []
         semaphore = asyncio.Semaphore(20)  # Higher concurrency
@@ -184,8 +213,12 @@ class EnhancedFreeProxyRotator:
                     return proxy
                 return None
         
-        logger.info(f"Testing {len(raw_proxies)} proxies...")
-        tasks = [test_with_semaphore(proxy) for proxy in raw_proxies]
+        logger.info(f"Testing {len(reachable)} reachable proxies...")
+        if not reachable:
+            logger.warning("No working proxies found from free sources")
+            self.last_updated = time.monotonic()
+            return
+        tasks = [asyncio.ensure_future(test_with_semaphore(proxy)) for proxy in reachable]
         
         # Use asyncio.wait with timeout for faster processing
         done, pending = await asyncio.wait(tasks, timeout=30.0)
@@ -207,32 +240,51 @@ class EnhancedFreeProxyRotator:
         if working_proxies:
             self.proxies = working_proxies
             random.shuffle(self.proxies)
+            self._cycle = itertools.cycle(self.proxies)
             logger.info(f"Updated proxy list: {len(self.proxies)} working proxies")
-            self.current_index = 0
         else:
             logger.warning("No working proxies found from free sources")
         
-        self.last_updated = time.time()
+        self.last_updated = time.monotonic()
+
+    async def _tcp_alive(self, host: str, port: int, timeout: float = 1.0) -> bool:
+        """Check that a proxy accepts TCP connections at all"""
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout=timeout)
+            writer.close()
+            await writer.wait_closed()
+            return True
+        except Exception:
+            return False
 
-    async def _test_proxy_fast(self, proxy: Dict[str, str], timeout: float = 3.0) -> bool:
-        """Fast proxy testing with shorter timeout"""
+    async def _test_proxy_fast(self, proxy: str, timeout: float = 3.0) -> bool:
+        """Fast proxy testing: HEAD a few empty-204 endpoints, first success wins"""
         try:
-            async with httpx.AsyncClient(proxies=proxy, timeout=timeout) as client:
-                resp = await client.get("http://httpbin.org/ip")
-                return resp.status_code == 200 and len(resp.text) > 0
+            transport = httpx.AsyncHTTPTransport(proxy=proxy)
+            async with httpx.AsyncClient(mounts={"all://": transport}, timeout=timeout) as client:
+                probes = [asyncio.ensure_future(client.head(u)) for u in _PROXY_HEALTH_URLS]
+                try:
+                    for fut in asyncio.as_completed(probes):
+                        try:
+                            resp = await fut
+                        except Exception:
+                            continue
+                        if resp.status_code == 204:
+                            return True
+                    return False
+                finally:
+                    for probe in probes:
+                        probe.cancel()
         except Exception:
             return False
 
     async def get_next_proxy(self) -> Optional[Dict[str, str]]:
         """Get next working proxy"""
-        await self.update_proxies()
-        
-        if not self.proxies:
-            return None
-        
-        proxy = self.proxies[self.current_index]
-        self.current_index = (self.current_index + 1) % len(self.proxies)
-        return proxy
+        if not self.proxies or time.monotonic() - self.last_updated >= self.update_interval:
+            await self.update_proxies()
+
+        proxy = next(self._cycle, None)
+        return as_httpx_proxies(proxy) if proxy else None
 
     def get_proxy_count(self) -> int:
         """Get current number of available proxies"""
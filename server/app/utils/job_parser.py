@@ -3,33 +3,69 @@ Advanced job parsing with support for multiple ATS platforms and JSON-LD.
 """
 from __future__ import annotations
 
+import copy
+import hashlib
+import threading
 from typing import Dict, Any, Optional, List
-from bs4 import BeautifulSoup
+from cachetools import LRUCache
+from selectolax.lexbor import LexborHTMLParser
 import json
 import re
 import logging
+from urllib.parse import urlparse
+from html import unescape as html_unescape
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+try:
+    import ijson as _ijson
+except ImportError:
+    _ijson = None
 
 logger = logging.getLogger(__name__)
 
+# JSON-LD blocks at least this large are streamed with ijson when it is installed
+_JSONLD_STREAM_MIN = 64 * 1024
+
+# Content digest -> parsed job, so duplicate pages skip the parse entirely
+_PARSE_CACHE: LRUCache = LRUCache(maxsize=4096)
+_PARSE_CACHE_LOCK = threading.Lock()
+
+# Runs of adjacent tags; '<' only opens a tag before a letter, '/' or '!' (as in the HTML tokenizer)
+_RE_TAG_RUN = re.compile(r'(?:<[A-Za-z/!][^>]*>)+')
+_CR_TABLE = str.maketrans({'\r': '\n'})
+# A newline run (with any surrounding spaces/tabs) or a run of spaces/tabs
+_RE_WS_COMBINED = re.compile(r'[ \t]*\n(?:[ \t]*\n)*[ \t]*|[ \t]+')
+
+def _collapse_ws(match: re.Match) -> str:
+    run = match.group()
+    newlines = run.count('\n')
+    if not newlines:
+        return ' '
+    return '\n\n' if newlines > 1 else '\n'
+
 def _clean_text(text: str) -> str:
     """Clean and normalize text content"""
     if not text:
         return ""
     
     # Replace common whitespace issues
-    text = re.sub(r'\r', '\n', text)
-    text = re.sub(r'\n{3,}', '\n\n', text)
-    text = re.sub(r'[ \t]+', ' ', text)
+    text = text.translate(_CR_TABLE)
+    text = _RE_WS_COMBINED.sub(_collapse_ws, text)
     text = text.strip()
     
     return text
 
 def _extract_text_safe(element) -> str:
-    """Safely extract text from BeautifulSoup element"""
+    """Safely extract text from a selectolax node"""
     if not element:
         return ""
     try:
-        return _clean_text(element.get_text(' ', strip=True))
+        return _clean_text(element.text(deep=True, separator=' ', strip=True))
     except Exception:
         return ""
 
@@ -43,68 +79,106 @@ def parse_job_from_html(url: str, html: str) -> Dict[str, Any]:
     if not html:
         return {"title": "Job", "company": None, "location": None, "description": "", "source_url": url}
     
-    soup = BeautifulSoup(html, 'lxml')
-    
+    # The same posting is often syndicated or re-crawled verbatim; only the source_url and
+    # the host-selected ATS parser depend on the URL, so key on those plus a content digest.
+    raw = html.encode("utf-8", "surrogatepass")
+    key = (_get_ats_parser(url), hashlib.blake2b(raw, digest_size=16).digest())
+    with _PARSE_CACHE_LOCK:
+        cached = _PARSE_CACHE.get(key)
+    if cached is None:
+        cached = _parse_job_tree(url, LexborHTMLParser(html))
+        with _PARSE_CACHE_LOCK:
+            _PARSE_CACHE[key] = cached
+    else:
+        logger.info(f"Reusing parse of identical content for {url}")
+    job_data = copy.deepcopy(cached)
+    job_data["source_url"] = url
+    return job_data
+
+def _parse_job_tree(url: str, tree: LexborHTMLParser) -> Dict[str, Any]:
+    """
+    Run the parse strategies on an already parsed page (uncached; see parse_job_from_html).
+    The generic fallback strips script/style/nav nodes from the tree in place.
+    """
     # Strategy 1: JSON-LD JobPosting
-    job_data = _parse_jsonld_jobposting(soup, url)
+    job_data = _parse_jsonld_jobposting(tree, url)
     if job_data and job_data.get("description"):
         logger.info(f"Successfully parsed {url} using JSON-LD")
         return job_data
     
-    # Strategy 2: ATS-specific parsing
-    ats_parsers = [
-        _parse_lever,
-        _parse_greenhouse,
-        _parse_workday,
-        _parse_bamboohr,
-        _parse_smartrecruiters,
-        _parse_ashbyhq,
-        _parse_jobvite,
-    ]
-    
-    for parser in ats_parsers:
+    # Strategy 2: ATS-specific parsing, dispatched on hostname
+    parser = _get_ats_parser(url)
+    if parser is not None:
         try:
-            job_data = parser(url, soup)
+            job_data = parser(url, tree)
             if job_data and job_data.get("description"):
                 logger.info(f"Successfully parsed {url} using {parser.__name__}")
                 return job_data
         except Exception as e:
             logger.warning(f"Parser {parser.__name__} failed for {url}: {e}")
-            continue
     
     # Strategy 3: Generic fallback
-    job_data = _parse_generic(url, soup)
+    job_data = _parse_generic(url, tree)
     logger.info(f"Parsed {url} using generic fallback")
     return job_data
 
-def _parse_jsonld_jobposting(soup: BeautifulSoup, url: str) -> Optional[Dict[str, Any]]:
+def _parse_jsonld_jobposting(tree: LexborHTMLParser, url: str) -> Optional[Dict[str, Any]]:
     """Parse JSON-LD JobPosting structured data"""
-    for script in soup.find_all('script', type='application/ld+json'):
+    for script in tree.css('script[type="application/ld+json"]'):
+        text = script.text()
+        # Cheap substring filter so unrelated blocks (BreadcrumbList, Organization) skip the parse
+        if len(text) < 2 or "JobPosting" not in text:
+            continue
+        if _ijson is not None and len(text) >= _JSONLD_STREAM_MIN:
+            # Aggregator pages embed whole catalogs; stream to the first JobPosting instead
+            try:
+                posting = _stream_jobposting(text.encode("utf-8"))
+            except _ijson.JSONError:
+                posting = None  # let the full parse below report the error
+            else:
+                if posting is not None:
+                    return _extract_from_jobposting(posting, url)
+                continue
         try:
-            data = json.loads(script.string or "{}")
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError
+            data = _json_loads(text)
             
-            # Handle both single objects and arrays
-            items = data if isinstance(data, list) else [data]
-            
-            for item in items:
-                if item.get("@type") == "JobPosting":
-                    return _extract_from_jobposting(item, url)
-                
-                # Sometimes nested in other structures
-                if isinstance(item, dict):
-                    for key, value in item.items():
-                        if isinstance(value, dict) and value.get("@type") == "JobPosting":
-                            return _extract_from_jobposting(value, url)
-                        elif isinstance(value, list):
-                            for subitem in value:
-                                if isinstance(subitem, dict) and subitem.get("@type") == "JobPosting":
-                                    return _extract_from_jobposting(subitem, url)
+            posting = _find_jobposting(data)
+            if posting is not None:
+                return _extract_from_jobposting(posting, url)
         except (json.JSONDecodeError, AttributeError) as e:
             logger.warning(f"Failed to parse JSON-LD: {e}")
             continue
     
     return None
 
+def _stream_jobposting(raw: bytes) -> Optional[Dict[str, Any]]:
+    """Locate the first JobPosting with ijson events, then build only that object"""
+    obj_prefix = None
+    for prefix, event, value in _ijson.parse(raw):
+        if event == "string" and value == "JobPosting" and (prefix == "@type" or prefix.endswith(".@type")):
+            obj_prefix = prefix[:-len("@type")].rstrip(".")
+            break
+    if obj_prefix is None:
+        return None
+    for obj in _ijson.items(raw, obj_prefix, use_float=True):
+        if isinstance(obj, dict) and obj.get("@type") == "JobPosting":
+            return obj
+    return None
+
+def _find_jobposting(data: Any) -> Optional[Dict[str, Any]]:
+    """Depth-first search for the first JobPosting object, covering arrays and @graph nesting"""
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if node.get("@type") == "JobPosting":
+                return node
+            stack.extend(reversed([v for v in node.values() if isinstance(v, (dict, list))]))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+    return None
+
 def _extract_from_jobposting(data: Dict[str, Any], url: str) -> Dict[str, Any]:
     """Extract job data from JobPosting structured data"""
     # Extract title
@@ -142,9 +216,11 @@ def _extract_from_jobposting(data: Dict[str, Any], url: str) -> Dict[str, Any]:
     # Extract description
     description = data.get("description", "")
     if description:
-        # Clean HTML from description
-        desc_soup = BeautifulSoup(description, 'lxml')
-        description = _clean_text(desc_soup.get_text('\n'))
+        # Clean HTML from description; short flat markup skips the parser spin-up
+        if len(description) < 4096 and "<script" not in description and "<style" not in description:
+            description = _clean_text(html_unescape(_RE_TAG_RUN.sub('\n', description)))
+        else:
+            description = _clean_text(LexborHTMLParser(description).text(separator='\n'))
     
     # Extract additional fields
     employment_type = data.get("employmentType")
@@ -175,20 +251,17 @@ def _extract_from_jobposting(data: Dict[str, Any], url: str) -> Dict[str, Any]:
         "source_url": url,
     }
 
-def _parse_lever(url: str, soup: BeautifulSoup) -> Optional[Dict[str, Any]]:
+def _parse_lever(url: str, tree: LexborHTMLParser) -> Optional[Dict[str, Any]]:
     """Parse Lever job pages"""
-    if "jobs.lever.co" not in url and "lever.co" not in url:
-        return None
-    
-    title = soup.find("h2", class_="posting-headline") or soup.find("h1") or soup.find("h2")
-    company = soup.find("a", {"data-qa": "company-name"}) or soup.select_one(".posting-headline .company")
-    location = soup.select_one(".location") or soup.select_one(".posting-headline .location")
+    title = tree.css_first("h2.posting-headline") or tree.css_first("h1") or tree.css_first("h2")
+    company = tree.css_first("a[data-qa='company-name']") or tree.css_first(".posting-headline .company")
+    location = tree.css_first(".location") or tree.css_first(".posting-headline .location")
     
     # Description can be in multiple containers
-    desc = (soup.select_one(".section-wrapper") or 
-           soup.select_one(".content") or 
-           soup.select_one(".posting-requirements") or
-           soup.select_one(".posting-description"))
+    desc = (tree.css_first(".section-wrapper") or 
+           tree.css_first(".content") or 
+           tree.css_first(".posting-requirements") or
+           tree.css_first(".posting-description"))
     
     return {
         "title": _extract_text_safe(title) or "Job",
@@ -198,18 +271,15 @@ def _parse_lever(url: str, soup: BeautifulSoup) -> Optional[Dict[str, Any]]:
         "source_url": url,
     }
 
-def _parse_greenhouse(url: str, soup: BeautifulSoup) -> Optional[Dict[str, Any]]:
+def _parse_greenhouse(url: str, tree: LexborHTMLParser) -> Optional[Dict[str, Any]]:
     """Parse Greenhouse job pages"""
-    if "boards.greenhouse.io" not in url and "greenhouse.io" not in url:
-        return None
+    title = tree.css_first("h1.app-title") or tree.css_first("h1")
+    company = tree.css_first(".company-name") or tree.css_first(".header-company-name")
+    location = tree.css_first(".location")
     
-    title = soup.select_one("h1.app-title") or soup.find("h1")
-    company = soup.select_one(".company-name") or soup.select_one(".header-company-name")
-    location = soup.select_one(".location")
-    
-    desc = (soup.select_one("#content") or 
-           soup.select_one(".content") or 
-           soup.select_one(".opening"))
+    desc = (tree.css_first("#content") or 
+           tree.css_first(".content") or 
+           tree.css_first(".opening"))
     
     return {
         "title": _extract_text_safe(title) or "Job",
@@ -219,18 +289,15 @@ def _parse_greenhouse(url: str, soup: BeautifulSoup) -> Optional[Dict[str, Any]]
         "source_url": url,
     }
 
-def _parse_workday(url: str, soup: BeautifulSoup) -> Optional[Dict[str, Any]]:
+def _parse_workday(url: str, tree: LexborHTMLParser) -> Optional[Dict[str, Any]]:
     """Parse Workday job pages"""
-    if ".myworkdayjobs.com" not in url and "workday" not in url:
-        return None
+    title = tree.css_first("h1")
+    company = tree.css_first("[data-automation-id='company']") or tree.css_first(".company")
+    location = tree.css_first("[data-automation-id='locations']") or tree.css_first(".location")
     
-    title = soup.find("h1")
-    company = soup.select_one("[data-automation-id='company']") or soup.select_one(".company")
-    location = soup.select_one("[data-automation-id='locations']") or soup.select_one(".location")
-    
-    desc = (soup.select_one("[data-automation-id='jobPostingDescription']") or
-           soup.select_one(".jobPostingDescription") or
-           soup.select_one("#jobDescription"))
+    desc = (tree.css_first("[data-automation-id='jobPostingDescription']") or
+           tree.css_first(".jobPostingDescription") or
+           tree.css_first("#jobDescription"))
     
     return {
         "title": _extract_text_safe(title) or "Job",
@@ -240,15 +307,12 @@ def _parse_workday(url: str, soup: BeautifulSoup) -> Optional[Dict[str, Any]]:
         "source_url": url,
     }
 
-def _parse_bamboohr(url: str, soup: BeautifulSoup) -> Optional[Dict[str, Any]]:
+def _parse_bamboohr(url: str, tree: LexborHTMLParser) -> Optional[Dict[str, Any]]:
     """Parse BambooHR job pages"""
-    if "bamboohr.com" not in url:
-        return None
-    
-    title = soup.find("h1") or soup.select_one(".job-title")
-    company = soup.select_one(".company-name") or soup.select_one(".employer-name")
-    location = soup.select_one(".job-location") or soup.select_one(".location")
-    desc = soup.select_one(".job-description") or soup.select_one(".description")
+    title = tree.css_first("h1") or tree.css_first(".job-title")
+    company = tree.css_first(".company-name") or tree.css_first(".employer-name")
+    location = tree.css_first(".job-location") or tree.css_first(".location")
+    desc = tree.css_first(".job-description") or tree.css_first(".description")
     
     return {
         "title": _extract_text_safe(title) or "Job",
@@ -258,15 +322,12 @@ def _parse_bamboohr(url: str, soup: BeautifulSoup) -> Optional[Dict[str, Any]]:
         "source_url": url,
     }
 
-def _parse_smartrecruiters(url: str, soup: BeautifulSoup) -> Optional[Dict[str, Any]]:
+def _parse_smartrecruiters(url: str, tree: LexborHTMLParser) -> Optional[Dict[str, Any]]:
     """Parse SmartRecruiters job pages"""
-    if "smartrecruiters.com" not in url:
-        return None
-    
-    title = soup.select_one("h1.details-header__job-title") or soup.find("h1")
-    company = soup.select_one(".details-header__company-name") or soup.select_one(".company-name")
-    location = soup.select_one(".details-header__job-location") or soup.select_one(".job-location")
-    desc = soup.select_one(".details__description") or soup.select_one(".job-description")
+    title = tree.css_first("h1.details-header__job-title") or tree.css_first("h1")
+    company = tree.css_first(".details-header__company-name") or tree.css_first(".company-name")
+    location = tree.css_first(".details-header__job-location") or tree.css_first(".job-location")
+    desc = tree.css_first(".details__description") or tree.css_first(".job-description")
     
     return {
         "title": _extract_text_safe(title) or "Job",
@@ -276,15 +337,12 @@ def _parse_smartrecruiters(url: str, soup: BeautifulSoup) -> Optional[Dict[str,
         "source_url": url,
     }
 
-def _parse_ashbyhq(url: str, soup: BeautifulSoup) -> Optional[Dict[str, Any]]:
+def _parse_ashbyhq(url: str, tree: LexborHTMLParser) -> Optional[Dict[str, Any]]:
     """Parse Ashby job pages"""
-    if "ashbyhq.com" not in url and "jobs.ashbyhq.com" not in url:
-        return None
-    
-    title = soup.find("h1") or soup.select_one(".job__title")
-    company = soup.select_one(".job__company") or soup.select_one(".company")
-    location = soup.select_one(".job__location") or soup.select_one(".location")
-    desc = soup.select_one(".job__description") or soup.select_one(".description")
+    title = tree.css_first("h1") or tree.css_first(".job__title")
+    company = tree.css_first(".job__company") or tree.css_first(".company")
+    location = tree.css_first(".job__location") or tree.css_first(".location")
+    desc = tree.css_first(".job__description") or tree.css_first(".description")
     
     return {
         "title": _extract_text_safe(title) or "Job",
@@ -294,15 +352,12 @@ def _parse_ashbyhq(url: str, soup: BeautifulSoup) -> Optional[Dict[str, Any]]:
         "source_url": url,
     }
 
-def _parse_jobvite(url: str, soup: BeautifulSoup) -> Optional[Dict[str, Any]]:
+def _parse_jobvite(url: str, tree: LexborHTMLParser) -> Optional[Dict[str, Any]]:
     """Parse Jobvite job pages"""
-    if "jobvite.com" not in url:
-        return None
-    
-    title = soup.select_one(".jv-job-detail-title") or soup.find("h1")
-    company = soup.select_one(".jv-job-detail-company") or soup.select_one(".company")
-    location = soup.select_one(".jv-job-detail-location") or soup.select_one(".location")
-    desc = soup.select_one(".jv-job-detail-description") or soup.select_one(".description")
+    title = tree.css_first(".jv-job-detail-title") or tree.css_first("h1")
+    company = tree.css_first(".jv-job-detail-company") or tree.css_first(".company")
+    location = tree.css_first(".jv-job-detail-location") or tree.css_first(".location")
+    desc = tree.css_first(".jv-job-detail-description") or tree.css_first(".description")
     
     return {
         "title": _extract_text_safe(title) or "Job",
@@ -312,71 +367,67 @@ def _parse_jobvite(url: str, soup: BeautifulSoup) -> Optional[Dict[str, Any]]:
         "source_url": url,
     }
 
-def _parse_generic(url: str, soup: BeautifulSoup) -> Dict[str, Any]:
-    """Generic fallback parser for job pages"""
-    # Try common selectors for title
-    title_selectors = [
-        "h1", "h2", ".job-title", ".title", ".posting-headline",
-        "[class*='title']", "[id*='title']"
-    ]
-    
-    title = None
-    for selector in title_selectors:
-        element = soup.select_one(selector)
-        if element:
-            title = _extract_text_safe(element)
-            if title and len(title) > 3:
-                break
-    
-    # Try common selectors for company
-    company_selectors = [
-        ".company", ".company-name", ".employer", "[data-company]",
-        "[class*='company']", "[class*='employer']"
-    ]
-    
-    company = None
-    for selector in company_selectors:
-        element = soup.select_one(selector)
-        if element:
-            company = _extract_text_safe(element)
-            if company and len(company) > 1:
-                break
-    
-    # Try common selectors for location
-    location_selectors = [
-        ".location", ".job-location", "[data-location]",
-        "[class*='location']", "[id*='location']"
-    ]
-    
-    location = None
-    for selector in location_selectors:
-        element = soup.select_one(selector)
-        if element:
-            location = _extract_text_safe(element)
-            if location and len(location) > 1:
-                break
-    
-    # Try common selectors for description
-    desc_selectors = [
-        ".description", ".job-description", ".content", ".job-content",
-        ".posting-description", "#job-description", "article", "main",
-        "[class*='description']", "[id*='description']"
-    ]
-    
-    description = ""
-    for selector in desc_selectors:
-        element = soup.select_one(selector)
+# (hostname substring, parser), checked in order
+_ATS_DISPATCH = (
+    ("lever.co", _parse_lever),
+    ("greenhouse.io", _parse_greenhouse),
+    ("workday", _parse_workday),
+    ("bamboohr.com", _parse_bamboohr),
+    ("smartrecruiters.com", _parse_smartrecruiters),
+    ("ashbyhq.com", _parse_ashbyhq),
+    ("jobvite.com", _parse_jobvite),
+)
+
+def _get_ats_parser(url: str):
+    """Return the ATS parser matching the URL's hostname, or None"""
+    host = urlparse(url).hostname or ""
+    for suffix, parser in _ATS_DISPATCH:
+        if suffix in host:
+            return parser
+    return None
+
+_GENERIC_TITLE_SELECTORS = (
+    "h1", "h2", ".job-title", ".title", ".posting-headline",
+    "[class*='title']", "[id*='title']"
+)
+_GENERIC_COMPANY_SELECTORS = (
+    ".company", ".company-name", ".employer", "[data-company]",
+    "[class*='company']", "[class*='employer']"
+)
+_GENERIC_LOCATION_SELECTORS = (
+    ".location", ".job-location", "[data-location]",
+    "[class*='location']", "[id*='location']"
+)
+_GENERIC_DESC_SELECTORS = (
+    ".description", ".job-description", ".content", ".job-content",
+    ".posting-description", "#job-description", "article", "main",
+    "[class*='description']", "[id*='description']"
+)
+
+def _probe_selectors(tree: LexborHTMLParser, selectors: tuple, min_len: int) -> Optional[str]:
+    """Return text for the first selector (in priority order) whose first match is longer than min_len."""
+    value = None
+    for selector in selectors:
+        element = tree.css_first(selector)
         if element:
-            description = _extract_text_safe(element)
-            if description and len(description) > 100:
+            value = _extract_text_safe(element)
+            if value and len(value) > min_len:
                 break
+    return value
+
+def _parse_generic(url: str, tree: LexborHTMLParser) -> Dict[str, Any]:
+    """Generic fallback parser for job pages"""
+    title = _probe_selectors(tree, _GENERIC_TITLE_SELECTORS, 3)
+    company = _probe_selectors(tree, _GENERIC_COMPANY_SELECTORS, 1)
+    location = _probe_selectors(tree, _GENERIC_LOCATION_SELECTORS, 1)
+    description = _probe_selectors(tree, _GENERIC_DESC_SELECTORS, 100) or ""
     
     # Fallback to body text if no good description found
     if not description or len(description) < 50:
-        # Remove script and style elements
-        for script in soup(["script", "style", "nav", "header", "footer"]):
-            script.decompose()
-        description = _clean_text(soup.get_text('\n'))
+        # Remove script, style and page chrome, then read only the body (skips <head>/<title>)
+        tree.strip_tags(["script", "style", "nav", "header", "footer", "noscript", "svg"])
+        body = tree.body or tree.root
+        description = _clean_text(body.text(separator='\n')) if body else ""
     
     return {
         "title": title or "Job",
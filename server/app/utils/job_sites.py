@@ -1,8 +1,15 @@
 from __future__ import annotations
 
 import re
+from functools import lru_cache
+from html import escape as html_escape, unescape as html_unescape
 from typing import Any, Dict, Optional
-from urllib.parse import urlparse, urljoin
+from urllib.parse import urljoin
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
 
 
 # Site-specific extraction patterns for better accuracy
@@ -65,81 +72,126 @@ SITE_PATTERNS = {
 }
 
 
+def _compile_fallback_patterns() -> Dict[str, Dict[str, list]]:
+    """Regex fallbacks for class/data-attribute selectors, built once per site."""
+    compiled: Dict[str, Dict[str, list]] = {}
+    for site_key, fields in SITE_PATTERNS.items():
+        compiled[site_key] = {
+            field: [
+                re.compile(
+                    rf'<[^>]*{re.escape(sel.replace("[", "").replace("]", ""))}[^>]*>([^<]+)</[^>]*>',
+                    re.IGNORECASE | re.DOTALL,
+                )
+                for sel in selectors
+                if "class" in sel or "data-" in sel
+            ]
+            for field, selectors in fields.items()
+        }
+    return compiled
+
+
+_SITE_FALLBACK_PATTERNS = _compile_fallback_patterns()
+
+# Per-site selector plans built once: (field, ((selector, is_meta), ...)) in priority order
+_SITE_SELECTOR_PLANS = {
+    site_key: tuple(
+        (field, tuple((sel, sel.startswith("meta[")) for sel in selectors))
+        for field, selectors in fields.items()
+    )
+    for site_key, fields in SITE_PATTERNS.items()
+}
+
+_RE_TRIPLE_NL = re.compile(r'\n\s*\n\s*\n')
+_RE_MULTI_SPACE = re.compile(r' +')
+_RE_LINK = re.compile(r'<a[^>]*href=["\']([^"\']*)["\'][^>]*>([^<]*)</a>', re.IGNORECASE | re.DOTALL)
+# Like _RE_LINK but also matches links wrapping inline markup (<a><strong>..</strong></a>)
+_RE_LINK_BLOCK = re.compile(r'<a\b[^>]*?href=["\']([^"\']*)["\'][^>]*>(.*?)</a>', re.IGNORECASE | re.DOTALL)
+_RE_TAG = re.compile(r'<[^>]+>')
+_RE_WS = re.compile(r'\s+')
+# Hostname of an http(s) URL (skipping any userinfo); cheaper than urlparse for lookups
+_RE_URL_HOST = re.compile(r'^https?://(?:[^/?#@]*@)?([^/:?#]+)', re.IGNORECASE)
+_RE_URL_ORIGIN = re.compile(r'^[a-z][a-z0-9+.-]*://[^/?#]+', re.IGNORECASE)
+# "contractor"/"internship" are covered by their "contract"/"intern" prefixes
+_RE_EMPLOYMENT = re.compile(r"full[- ]time|part[- ]time|contract|intern", re.IGNORECASE)
+_EMPLOYMENT_BY_PREFIX = {"full": "full-time", "part": "part-time", "cont": "contract", "inte": "internship"}
+_EMPLOYMENT_PRIORITY = ("full-time", "part-time", "contract", "internship")
+_RE_TITLE_PFX = re.compile(r"^(Job:|Position:|Role:)\s*", re.IGNORECASE)
+_RE_TITLE_SFX = re.compile(r"\s*-\s*(Job|Position|Role)$", re.IGNORECASE)
+_RE_LOC_PFX = re.compile(r"^Location:\s*", re.IGNORECASE)
+_RE_LOC_PAREN = re.compile(r"\s*\([^)]*\)$")
+
+
+def _url_origin(base_url: str) -> Optional[str]:
+    """scheme://authority of base_url, computed once per description pass."""
+    match = _RE_URL_ORIGIN.match(base_url)
+    return match.group(0) if match else None
+
+
+def _readable_link(href: str, link_text: str, base_url: str, origin: Optional[str] = None) -> str:
+    """Render a link as "Link Text (URL)", resolving relative URLs against base_url."""
+    # Handle relative URLs; plain root-relative paths only need the origin prefixed
+    if origin and href.startswith('/') and not href.startswith('//') and '/.' not in href:
+        href = origin + href
+    elif href.startswith(('/', './')):
+        href = urljoin(base_url, href)
+    
+    if link_text and href:
+        if link_text.lower() != href.lower():
+            return f"{link_text} ({href})"
+        return href
+    elif link_text:
+        return link_text
+    elif href:
+        return href
+    return "[Link]"
+
+
 def _format_lever_description_with_links(element, base_url: str) -> str:
     """Format Lever job description converting links to readable text with URLs."""
     try:
-        from bs4 import BeautifulSoup, NavigableString
-        
-        # Clone the element to avoid modifying the original
-        desc_clone = element.__copy__()
+        origin = _url_origin(base_url)
         
-        # Find all links in the description
-        links = desc_clone.find_all('a', href=True)
+        def replace_link(match):
+            href = html_unescape(match.group(1)).strip()
+            link_text = _RE_WS.sub(' ', html_unescape(_RE_TAG.sub('', match.group(2)))).strip()
+            return html_escape(_readable_link(href, link_text, base_url, origin), quote=False)
         
-        for link in links:
-            href = link.get('href', '')
-            link_text = link.get_text(strip=True)
-            
-            # Handle relative URLs
-            if href.startswith('/') or href.startswith('./'):
-                href = urljoin(base_url, href)
-            
-            # Create readable format: "Link Text (URL)"
-            if link_text and href:
-                if link_text.lower() != href.lower():
-                    readable_link = f"{link_text} ({href})"
-                else:
-                    readable_link = href
-            elif link_text:
-                readable_link = link_text
-            elif href:
-                readable_link = href
-            else:
-                readable_link = "[Link]"
-            
-            # Replace the link with readable text
-            link.replace_with(readable_link)
+        # Rewrite links on the serialized subtree instead of cloning and mutating a DOM
+        rewritten = _RE_LINK_BLOCK.sub(replace_link, element.html)
         
         # Get the formatted text
-        formatted_text = desc_clone.get_text('\n', strip=True)
+        formatted_text = LexborHTMLParser(rewritten).text(separator='\n', strip=True)
         
         # Clean up extra whitespace and normalize line breaks
-        formatted_text = re.sub(r'\n\s*\n\s*\n', '\n\n', formatted_text)
-        formatted_text = re.sub(r' +', ' ', formatted_text)
+        formatted_text = _RE_TRIPLE_NL.sub('\n\n', formatted_text)
+        formatted_text = _RE_MULTI_SPACE.sub(' ', formatted_text)
         
         return formatted_text
         
     except Exception:
         # Fallback to regular text extraction
-        return element.get_text(strip=True)
+        return element.text(strip=True)
+
+
+# Registrable domain (last two labels) -> SITE_PATTERNS key
+_HOST_SUFFIX_MAP = {site_key: site_key for site_key in SITE_PATTERNS}
+_HOST_SUFFIX_MAP.update({
+    "myworkday.com": "workday.com",
+    "myworkdayjobs.com": "workday.com",
+})
+
+
+@lru_cache(maxsize=4096)
+def _site_key_for_host(hostname: str) -> Optional[str]:
+    # Covers both apex and subdomains (e.g., company.greenhouse.io)
+    return _HOST_SUFFIX_MAP.get(".".join(hostname.rsplit(".", 2)[-2:]))
 
 
 def get_site_key(url: str) -> Optional[str]:
     """Extract site key from URL for pattern matching."""
     try:
-        hostname = urlparse(url).hostname or ""
-        hostname = hostname.lower()
-        
-        # Direct matches
-        for site_key in SITE_PATTERNS:
-            if site_key in hostname:
-                return site_key
-        
-        # Handle subdomains (e.g., company.greenhouse.io)
-        if hostname.endswith(".greenhouse.io"):
-            return "greenhouse.io"
-        elif hostname.endswith(".lever.co"):
-            return "lever.co"
-        elif hostname.endswith(".workday.com"):
-            return "workday.com"
-        elif hostname.endswith(".jobvite.com"):
-            return "jobvite.com"
-        elif hostname.endswith(".bamboohr.com"):
-            return "bamboohr.com"
-        elif hostname.endswith(".smartrecruiters.com"):
-            return "smartrecruiters.com"
-        
-        return None
+        match = _RE_URL_HOST.match(url)
+        return _site_key_for_host(match.group(1).lower()) if match else None
     except Exception:
         return None
 
@@ -150,56 +202,46 @@ def extract_with_site_patterns(url: str, html: str) -> Dict[str, Any]:
     if not site_key or site_key not in SITE_PATTERNS:
         return {}
     
-    patterns = SITE_PATTERNS[site_key]
+    if LexborHTMLParser is not None:
+        return _extract_site_fields(url, site_key, LexborHTMLParser(html))
+    
+    # Fallback to regex if selectolax not available
     result: Dict[str, Any] = {}
+    for field, field_patterns in _SITE_FALLBACK_PATTERNS[site_key].items():
+        for pattern in field_patterns:
+            # Simple regex for common patterns
+            match = pattern.search(html)
+            if match:
+                result[field] = match.group(1).strip()
+                break
     
-    try:
-        from bs4 import BeautifulSoup
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        for field, selectors in patterns.items():
-            if field in result and result[field]:  # Skip if already found
-                continue
-                
-            for selector in selectors:
-                try:
-                    if selector.startswith("meta["):
-                        # Handle meta tags specially
-                        el = soup.select_one(selector)
-                        if el:
-                            result[field] = el.get('content', '').strip()
-                            break
-                    else:
-                        el = soup.select_one(selector)
-                        if el:
-                            # Special handling for description fields with links
-                            if field == "description" and site_key == "lever.co":
-                                text = _format_lever_description_with_links(el, url)
-                            else:
-                                text = el.get_text(strip=True)
-                            
-                            if text and len(text) > 2:
-                                result[field] = text
-                                break
-                except Exception:
-                    continue
+    return result
+
+
+def _extract_site_fields(url: str, site_key: str, tree: "LexborHTMLParser") -> Dict[str, Any]:
+    result: Dict[str, Any] = {}
     
-    except ImportError:
-        # Fallback to regex if BeautifulSoup not available
-        for field, selectors in patterns.items():
-            if field in result and result[field]:
-                continue
-            for selector in selectors:
-                try:
-                    if "class" in selector or "data-" in selector:
-                        # Simple regex for common patterns
-                        pattern = rf'<[^>]*{re.escape(selector.replace("[", "").replace("]", ""))}[^>]*>([^<]+)</[^>]*>'
-                        match = re.search(pattern, html, re.IGNORECASE | re.DOTALL)
-                        if match:
-                            result[field] = match.group(1).strip()
-                            break
-                except Exception:
+    for field, selectors in _SITE_SELECTOR_PLANS[site_key]:
+        for selector, is_meta in selectors:
+            try:
+                el = tree.css_first(selector)
+                if not el:
                     continue
+                if is_meta:
+                    # Handle meta tags specially
+                    result[field] = (el.attributes.get('content') or '').strip()
+                    break
+                # Special handling for description fields with links
+                if field == "description" and site_key == "lever.co":
+                    text = _format_lever_description_with_links(el, url)
+                else:
+                    text = el.text(strip=True)
+                
+                if text and len(text) > 2:
+                    result[field] = text
+                    break
+            except Exception:
+                continue
     
     return result
 
@@ -210,64 +252,62 @@ def _format_description_links(description: str, base_url: str) -> str:
         return description
     
     try:
-        # Pattern to match HTML links: <a href="url">text</a>
-        link_pattern = r'<a[^>]*href=["\']([^"\']*)["\'][^>]*>([^<]*)</a>'
+        origin = _url_origin(base_url)
         
         def replace_link(match):
-            href = match.group(1).strip()
-            link_text = match.group(2).strip()
-            
-            # Handle relative URLs
-            if href.startswith('/') or href.startswith('./'):
-                href = urljoin(base_url, href)
-            
-            # Create readable format
-            if link_text and href:
-                if link_text.lower() != href.lower() and len(link_text) > 0:
-                    return f"{link_text} ({href})"
-                else:
-                    return href
-            elif link_text:
-                return link_text
-            elif href:
-                return href
-            else:
-                return "[Link]"
+            return _readable_link(match.group(1).strip(), match.group(2).strip(), base_url, origin)
         
         # Replace all links
-        formatted = re.sub(link_pattern, replace_link, description, flags=re.IGNORECASE | re.DOTALL)
+        formatted = _RE_LINK.sub(replace_link, description)
         
         # Clean up any remaining HTML tags
-        formatted = re.sub(r'<[^>]+>', '', formatted)
+        formatted = _RE_TAG.sub('', formatted)
         
         # Normalize whitespace
-        formatted = re.sub(r'\s+', ' ', formatted).strip()
+        formatted = _RE_WS.sub(' ', formatted).strip()
         
         return formatted
         
     except Exception:
         # Fallback: just remove HTML tags
-        return re.sub(r'<[^>]+>', '', description).strip()
+        return _RE_TAG.sub('', description).strip()
+
+
+def _employment_type_from_text(text: str) -> Optional[str]:
+    """Single scan for employment-type keywords; the highest-priority type seen wins."""
+    found = set()
+    for match in _RE_EMPLOYMENT.finditer(text):
+        employment_type = _EMPLOYMENT_BY_PREFIX[match.group(0)[:4].lower()]
+        if employment_type == _EMPLOYMENT_PRIORITY[0]:
+            return employment_type
+        found.add(employment_type)
+    for employment_type in _EMPLOYMENT_PRIORITY:
+        if employment_type in found:
+            return employment_type
+    return None
+
 
+def enhance_job_data(data: Dict[str, Any], url: str, copy: bool = False) -> Dict[str, Any]:
+    """Post-process extracted data with common sense improvements.
 
-def enhance_job_data(data: Dict[str, Any], url: str) -> Dict[str, Any]:
-    """Post-process extracted data with common sense improvements."""
-    enhanced = data.copy()
+    Mutates and returns ``data`` unless ``copy`` is True.
+    """
+    enhanced = data.copy() if copy else data
     
     # Clean and normalize title
     if "title" in enhanced and enhanced["title"]:
         title = str(enhanced["title"])
         # Remove common job board prefixes/suffixes
-        title = re.sub(r"^(Job:|Position:|Role:)\s*", "", title, flags=re.IGNORECASE)
-        title = re.sub(r"\s*-\s*(Job|Position|Role)$", "", title, flags=re.IGNORECASE)
+        title = _RE_TITLE_PFX.sub("", title)
+        title = _RE_TITLE_SFX.sub("", title)
         enhanced["title"] = title.strip()
     
     # Normalize location
     if "location" in enhanced and enhanced["location"]:
         location = str(enhanced["location"])
         # Clean up common location formats
-        location = re.sub(r"^Location:\s*", "", location, flags=re.IGNORECASE)
-        location = re.sub(r"\s*\([^)]*\)$", "", location)  # Remove parenthetical info
+        location = _RE_LOC_PFX.sub("", location)
+        location = _RE_LOC_PAREN.sub("", location)  # Remove parenthetical info
         enhanced["location"] = location.strip()
     
     # Format description links for better readability
@@ -279,15 +319,9 @@ def enhance_job_data(data: Dict[str, Any], url: str) -> Dict[str, Any]:
     
     # Extract employment type from description if not found
     if not enhanced.get("employment_type") and enhanced.get("description"):
-        desc = str(enhanced["description"]).lower()
-        if "full-time" in desc or "full time" in desc:
-            enhanced["employment_type"] = "full-time"
-        elif "part-time" in desc or "part time" in desc:
-            enhanced["employment_type"] = "part-time"
-        elif "contract" in desc or "contractor" in desc:
-            enhanced["employment_type"] = "contract"
-        elif "intern" in desc or "internship" in desc:
-            enhanced["employment_type"] = "internship"
+        employment_type = _employment_type_from_text(str(enhanced["description"]))
+        if employment_type:
+            enhanced["employment_type"] = employment_type
     
     # Add source URL
     enhanced["source_url"] = url
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Any, Dict, Optional
 import re
+import string
 
 
 EMPLOYMENT_MAP = {
@@ -15,46 +17,57 @@ EMPLOYMENT_MAP = {
     "freelance": "CONTRACTOR",
 }
 
+_RE_REMOTE = re.compile(r"\bremote\b", re.I)
+_RE_CITY_ST = re.compile(r"^\s*([A-Za-z .'-]{2,60})\s*,\s*([A-Z]{2})\s*$")
+_RE_CITY_COUNTRY = re.compile(r"^\s*([A-Za-z .'-]{2,60})\s*,\s*([A-Za-z .'-]{2,60})\s*$")
+# Same character class as the location regexes, for the split fast path
+_LOC_CHARS = frozenset(string.ascii_letters + " .'-")
+
+
+@lru_cache(maxsize=4096)
+def _location_parts(s: str) -> tuple[str, ...]:
+    """Classify a stripped location string; batches repeat the same few locations."""
+    # Substring test first; the word-boundary regex only runs when "remote" is present at all
+    if "remote" in s.lower() and _RE_REMOTE.search(s):
+        return ("remote",)
+    # Common "City, ST" / "City, Country" shapes are settled with str ops; anything the
+    # split cannot vouch for still goes through the regexes below
+    if s.count(",") == 1:
+        city, _, tail = s.partition(",")
+        city, tail = city.strip(), tail.strip()
+        if 2 <= len(city) <= 60 and _LOC_CHARS.issuperset(city):
+            if len(tail) == 2 and tail.isascii() and tail.isalpha() and tail.isupper():
+                return ("region", city, tail)
+            if 2 <= len(tail) <= 60 and _LOC_CHARS.issuperset(tail):
+                return ("country", city, tail)
+    # Try City, ST pattern
+    m = _RE_CITY_ST.search(s)
+    if m:
+        return ("region", m.group(1).strip(), m.group(2).strip())
+    # Fallback: City, Country
+    m2 = _RE_CITY_COUNTRY.search(s)
+    if m2:
+        return ("country", m2.group(1).strip(), m2.group(2).strip())
+    # Plain text fallback
+    return ("text", s)
+
 
 def _parse_location(loc: Optional[str]) -> Dict[str, Any]:
     result: Dict[str, Any] = {}
     if not loc:
         return result
-    s = loc.strip()
-    if re.search(r"\bremote\b", s, re.I):
+    # The cache holds immutable tuples; the JSON-LD dicts are rebuilt per call so callers may mutate them
+    kind, *parts = _location_parts(loc.strip())
+    if kind == "remote":
         result["jobLocationType"] = "TELECOMMUTE"
         return result
-    # Try City, ST pattern
-    m = re.search(r"^\s*([A-Za-z .'-]{2,60})\s*,\s*([A-Z]{2})\s*$", s)
-    if m:
-        city, st = m.group(1).strip(), m.group(2).strip()
-        result["jobLocation"] = [{
-            "@type": "Place",
-            "address": {
-                "@type": "PostalAddress",
-                "addressLocality": city,
-                "addressRegion": st,
-            }
-        }]
-        return result
-    # Fallback: City, Country
-    m2 = re.search(r"^\s*([A-Za-z .'-]{2,60})\s*,\s*([A-Za-z .'-]{2,60})\s*$", s)
-    if m2:
-        city, country = m2.group(1).strip(), m2.group(2).strip()
-        result["jobLocation"] = [{
-            "@type": "Place",
-            "address": {
-                "@type": "PostalAddress",
-                "addressLocality": city,
-                "addressCountry": country,
-            }
-        }]
-        return result
-    # Plain text fallback
-    result["jobLocation"] = [{
-        "@type": "Place",
-        "address": {"@type": "PostalAddress", "addressLocality": s}
-    }]
+    if kind == "region":
+        address = {"@type": "PostalAddress", "addressLocality": parts[0], "addressRegion": parts[1]}
+    elif kind == "country":
+        address = {"@type": "PostalAddress", "addressLocality": parts[0], "addressCountry": parts[1]}
+    else:
+        address = {"@type": "PostalAddress", "addressLocality": parts[0]}
+    result["jobLocation"] = [{"@type": "Place", "address": address}]
     return result
 
 
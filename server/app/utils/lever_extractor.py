@@ -5,9 +5,196 @@ Specialized Lever Job Extractor
 Fine-tuned for accurate extraction from all Lever job postings.
 """
 
+import json
 import re
-from typing import Any, Dict, Optional, List
-from urllib.parse import urljoin
+from typing import Any, Dict, Iterable, Optional, List
+from urllib.parse import urlparse
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+# Salary range in the posting body text, e.g. "$120,000 - $150,000 / year"
+_SALARY_RANGE_RE = re.compile(r'\$(\d{1,3}(?:,\d{3})*)\s*-\s*\$(\d{1,3}(?:,\d{3})*)\s*/?\s*year', re.IGNORECASE)
+
+# Unicode spaces (NBSP, U+2000-U+200B, narrow NBSP, medium math space, ideographic) -> ' '
+_WS_TABLE = {c: ' ' for c in [0x00A0, 0x202F, 0x205F, 0x3000, *range(0x2000, 0x200C)]}
+_MULTI_NL = re.compile(r'\n\s*\n\s*\n')
+_MULTI_SP = re.compile(r' +')
+_TAG_RE = re.compile(r'<[^>]+>')
+
+def _next_sibling_tag(node, tags: tuple):
+    """First following sibling element whose tag is in ``tags``."""
+    sibling = node.next
+    while sibling is not None:
+        if sibling.tag in tags:
+            return sibling
+        sibling = sibling.next
+    return None
+
+
+def _section_parts(section):
+    """
+    (h3 heading, following div/ul) of a Lever section from one pass over its direct children;
+    falls back to a subtree search when the heading is nested deeper.
+    """
+    heading = None
+    for child in section.iter():
+        if heading is None:
+            if child.tag == 'h3':
+                heading = child
+        elif child.tag in ('div', 'ul'):
+            return heading, child
+    if heading is not None:
+        return heading, None
+    heading = section.css_first('h3')
+    if heading is None:
+        return None, None
+    return heading, _next_sibling_tag(heading, ('div', 'ul'))
+
+
+# Section heading keywords -> result field, checked in order (first hit wins)
+_SECTION_LIST_FIELDS = (
+    (('responsibilit', 'what you'), 'responsibilities'),
+    (('require', 'qualif'), 'requirements'),
+    (('benefit', 'what we offer'), 'benefits'),
+    (('value', 'what we value'), 'values'),
+)
+_SECTION_TEXT_FIELDS = (
+    (('responsibilit',), 'responsibilities_text'),
+    (('require',), 'requirements_text'),
+    (('benefit',), 'benefits_text'),
+)
+
+# Link text keywords -> link type, for links that aren't apply/email/phone
+_LINK_TEXT_TYPES = (
+    (('career', 'life at', 'culture', 'about'), 'company_info'),
+    (('benefit', 'compensation', 'package'), 'benefits'),
+)
+
+
+def _keyword_field(text_lower: str, table: tuple) -> Optional[str]:
+    """First label in ``table`` whose keywords occur in ``text_lower``."""
+    for keywords, label in table:
+        for keyword in keywords:
+            if keyword in text_lower:
+                return label
+    return None
+
+
+def _normalize_jsonld_location(jl: Any) -> Optional[str]:
+    try:
+        if isinstance(jl, list) and jl:
+            jl = jl[0]
+        if isinstance(jl, dict):
+            addr = jl.get('address') or {}
+            locality = (addr.get('addressLocality') or '').strip()
+            region = (addr.get('addressRegion') or '').strip()
+            country = (addr.get('addressCountry') or '').strip()
+            parts = [p for p in [locality, region, country] if p]
+            if parts:
+                return ', '.join(parts)
+            name = jl.get('name')
+            if name:
+                return str(name).strip()
+    except Exception:
+        return None
+    return None
+
+
+# When JSON-LD provides all of these, DOM lookups for title/company/location are skipped
+_JSONLD_CORE_FIELDS = frozenset({'title', 'company', 'location', 'description'})
+_BASIC_FIELDS = frozenset({'title', 'company', 'location', 'department', 'employment_type', 'workplace_type'})
+
+
+# Lever-specific CSS selectors based on actual HTML structure analysis
+_LEVER_SELECTORS: Dict[str, tuple] = {
+    'title': (
+        '.posting-headline h2',
+        'h2',
+        '[data-qa="job-title"]',
+        '.posting-headline .posting-title'
+    ),
+    'company': (
+        '.main-header-logo img@alt',  # Company from logo alt text
+        '.main-header-content .main-header-company',
+        'meta[property="og:site_name"]@content',
+        '.hiringOrganization .name'
+    ),
+    'location': (
+        '.posting-categories .location',
+        '.sort-by-time.location',
+        '.posting-category.location',
+        '[class*="location"]'
+    ),
+    'department': (
+        '.posting-categories .department',
+        '.sort-by-team',
+        '.posting-category.department'
+    ),
+    'employment_type': (
+        '.posting-categories .commitment',
+        '.sort-by-commitment',
+        '.posting-category.commitment'
+    ),
+    'workplace_type': (
+        '.posting-categories .workplaceTypes',
+        '.posting-category.workplaceTypes'
+    ),
+    'description': (
+        '.section[data-qa="job-description"]',
+        '.section.page-centered',
+        '.posting-content'
+    ),
+    'responsibilities': (
+        'h3:contains("Core Responsibilities") + div',
+        'h3:contains("Responsibilities") + div',
+        'h3:contains("What You\'ll Do") + div'
+    ),
+    'requirements': (
+        'h3:contains("What We Require") + div',
+        'h3:contains("Requirements") + div',
+        'h3:contains("Qualifications") + div'
+    ),
+    'benefits': (
+        'h3:contains("Benefits") + div',
+        'h3:contains("What We Offer") + div',
+        'h3:contains("Compensation") + div'
+    ),
+    'values': (
+        'h3:contains("What We Value") + div',
+        'h3:contains("Our Values") + div'
+    ),
+    'apply_link': (
+        '.postings-btn[href*="apply"]',
+        'a[href*="apply"]',
+        '.template-btn-submit'
+    ),
+    'salary': (
+        '[data-qa="closing-description"]:contains("salary")',
+        'div:contains("$"):contains("year")',
+        'div:contains("salary range")'
+    )
+}
+
+# Selector plans prepared once at import: per field, the (css, attribute) pairs in priority order.
+# ":contains" pseudos are not CSS and are skipped.
+_LEVER_SELECTOR_PLANS = {
+    field: tuple(
+        (sel.split('@')[0], sel.split('@')[1] if '@' in sel else None)
+        for sel in selectors if ':contains' not in sel
+    )
+    for field, selectors in _LEVER_SELECTORS.items()
+}
+
+
+def _field_candidates(tree, field: str):
+    """Yield (attribute or None, first element matching the selector) in selector priority order."""
+    for css, attr in _LEVER_SELECTOR_PLANS[field]:
+        element = tree.css_first(css)
+        if element is not None:
+            yield attr, element
 
 
 class LeverJobExtractor:
@@ -16,113 +203,38 @@ class LeverJobExtractor:
     and comprehensive content extraction.
     """
     
-    def __init__(self):
-        # Lever-specific CSS selectors based on actual HTML structure analysis
-        self.lever_selectors = {
-            'title': [
-                '.posting-headline h2',
-                'h2',
-                '[data-qa="job-title"]',
-                '.posting-headline .posting-title'
-            ],
-            'company': [
-                '.main-header-logo img@alt',  # Company from logo alt text
-                '.main-header-content .main-header-company',
-                'meta[property="og:site_name"]@content',
-                '.hiringOrganization .name'
-            ],
-            'location': [
-                '.posting-categories .location',
-                '.sort-by-time.location',
-                '.posting-category.location',
-                '[class*="location"]'
-            ],
-            'department': [
-                '.posting-categories .department',
-                '.sort-by-team',
-                '.posting-category.department'
-            ],
-            'employment_type': [
-                '.posting-categories .commitment',
-                '.sort-by-commitment',
-                '.posting-category.commitment'
-            ],
-            'workplace_type': [
-                '.posting-categories .workplaceTypes',
-                '.posting-category.workplaceTypes'
-            ],
-            'description': [
-                '.section[data-qa="job-description"]',
-                '.section.page-centered',
-                '.posting-content'
-            ],
-            'responsibilities': [
-                'h3:contains("Core Responsibilities") + div',
-                'h3:contains("Responsibilities") + div',
-                'h3:contains("What You\'ll Do") + div'
-            ],
-            'requirements': [
-                'h3:contains("What We Require") + div',
-                'h3:contains("Requirements") + div',
-                'h3:contains("Qualifications") + div'
-            ],
-            'benefits': [
-                'h3:contains("Benefits") + div',
-                'h3:contains("What We Offer") + div',
-                'h3:contains("Compensation") + div'
-            ],
-            'values': [
-                'h3:contains("What We Value") + div',
-                'h3:contains("Our Values") + div'
-            ],
-            'apply_link': [
-                '.postings-btn[href*="apply"]',
-                'a[href*="apply"]',
-                '.template-btn-submit'
-            ],
-            'salary': [
-                '[data-qa="closing-description"]:contains("salary")',
-                'div:contains("$"):contains("year")',
-                'div:contains("salary range")'
-            ]
-        }
-        
-        # Lever-specific patterns for better extraction
-        self.lever_patterns = {
-            'salary_range': r'\$(\d{1,3}(?:,\d{3})*)\s*-\s*\$(\d{1,3}(?:,\d{3})*)\s*/?\s*year',
-            'email_link': r'mailto:([a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,})',
-            'phone_link': r'tel:([+\d\s()-]+)',
-            'company_website': r'https?://(?:www\.)?([a-zA-Z0-9.-]+\.com)',
-        }
-
     def extract_lever_job(self, url: str, html: str) -> Dict[str, Any]:
         """
         Extract comprehensive job data from Lever posting with high accuracy.
         """
-        try:
-            from bs4 import BeautifulSoup
-        except ImportError:
+        if LexborHTMLParser is None:
             return self._fallback_lever_extraction(html, url)
         
-        soup = BeautifulSoup(html, 'html.parser')
+        # Lexbor has no parse_only/strainer equivalent, and trimming scripts/styles/svg with a
+        # regex before parsing measured several times slower than letting Lexbor parse them
+        tree = LexborHTMLParser(html)
         result = {}
         
         # Extract JSON-LD structured data first (highest priority)
-        json_ld_data = self._extract_lever_json_ld(soup)
+        json_ld_data = self._extract_lever_json_ld(tree)
         if json_ld_data:
             result.update(json_ld_data)
         
-        # Extract basic job information
-        result.update(self._extract_lever_basics(soup))
+        # Extract basic job information; a complete JSON-LD block is authoritative for the
+        # core fields, so only the DOM-only ones (department, commitment, workplace) are read
+        if _JSONLD_CORE_FIELDS <= result.keys():
+            result.update(self._extract_lever_basics(tree, skip=_JSONLD_CORE_FIELDS))
+        else:
+            result.update(self._extract_lever_basics(tree))
         
         # Extract detailed sections
-        result.update(self._extract_lever_sections(soup))
+        result.update(self._extract_lever_sections(tree))
         
         # Extract links and contact information
-        result['links'] = self._extract_lever_links(soup, url)
+        result['links'] = self._extract_lever_links(tree, url)
         
         # Extract salary information
-        salary_info = self._extract_lever_salary(soup)
+        salary_info = self._extract_lever_salary(tree)
         if salary_info:
             result.update(salary_info)
         
@@ -131,217 +243,185 @@ class LeverJobExtractor:
         
         return result
 
-    def _extract_lever_json_ld(self, soup) -> Dict[str, Any]:
+    def _extract_lever_json_ld(self, tree) -> Dict[str, Any]:
         """Extract structured data from JSON-LD script tag with robust handling."""
-        scripts = soup.find_all('script', type='application/ld+json')
-        
-        def normalize_location(jl: Any) -> Optional[str]:
-            try:
-                if isinstance(jl, list) and jl:
-                    jl = jl[0]
-                if isinstance(jl, dict):
-                    addr = jl.get('address') or {}
-                    locality = (addr.get('addressLocality') or '').strip()
-                    region = (addr.get('addressRegion') or '').strip()
-                    country = (addr.get('addressCountry') or '').strip()
-                    parts = [p for p in [locality, region, country] if p]
-                    if parts:
-                        return ', '.join(parts)
-                    name = jl.get('name')
-                    if name:
-                        return str(name).strip()
-            except Exception:
-                return None
-            return None
-        
-        for script in scripts:
+        for script in tree.css('script[type="application/ld+json"]'):
             try:
-                import json
-                data = json.loads(script.get_text())
+                data = json.loads(script.text())
             except Exception:
                 continue
             
-            # Handle direct object, list, or @graph
-            items: List[Dict[str, Any]] = []
-            if isinstance(data, dict):
-                if data.get('@type') == 'JobPosting':
-                    items = [data]
-                elif isinstance(data.get('@graph'), list):
-                    items = [it for it in data['@graph'] if isinstance(it, dict) and it.get('@type') == 'JobPosting']
-            elif isinstance(data, list):
-                items = [it for it in data if isinstance(it, dict) and it.get('@type') == 'JobPosting']
+            result = self._parse_lever_jobposting_dict(data)
+            if result:
+                return result
+        
+        return {}
+
+    def _parse_lever_jobposting_dict(self, data: Any) -> Dict[str, Any]:
+        """Map the first usable JobPosting in a decoded JSON-LD payload to Lever fields."""
+        # Handle direct object, list, or @graph; candidates are generated lazily so the scan
+        # stops at the first JobPosting that yields data
+        candidates: Iterable[Any] = ()
+        if isinstance(data, dict):
+            if data.get('@type') == 'JobPosting':
+                candidates = (data,)
+            elif isinstance(data.get('@graph'), list):
+                candidates = data['@graph']
+        elif isinstance(data, list):
+            candidates = data
+        items = (it for it in candidates if isinstance(it, dict) and it.get('@type') == 'JobPosting')
+        
+        for item in items:
+            result: Dict[str, Any] = {}
+            if item.get('title'):
+                result['title'] = str(item['title']).strip()
             
-            for item in items:
-                result: Dict[str, Any] = {}
-                if item.get('title'):
-                    result['title'] = str(item['title']).strip()
-                
-                org = item.get('hiringOrganization') or {}
-                if isinstance(org, dict) and org.get('name'):
-                    result['company'] = str(org['name']).strip()
-                
-                loc = normalize_location(item.get('jobLocation'))
-                if loc:
-                    result['location'] = loc
-                
-                emp = item.get('employmentType')
-                if emp:
-                    if isinstance(emp, list):
-                        emp = emp[0]
-                    result['employment_type'] = str(emp).lower().replace('_', '-').strip()
-                
-                if item.get('datePosted'):
-                    result['date_posted'] = item['datePosted']
-                
-                if item.get('description'):
-                    result['description'] = self._clean_html_description(str(item['description']))
-                
-                if result:
-                    return result
+            org = item.get('hiringOrganization') or {}
+            if isinstance(org, dict) and org.get('name'):
+                result['company'] = str(org['name']).strip()
+            
+            loc = _normalize_jsonld_location(item.get('jobLocation'))
+            if loc:
+                result['location'] = loc
+            
+            emp = item.get('employmentType')
+            if emp:
+                if isinstance(emp, list):
+                    emp = emp[0]
+                result['employment_type'] = str(emp).lower().replace('_', '-').strip()
+            
+            if item.get('datePosted'):
+                result['date_posted'] = item['datePosted']
+            
+            if item.get('description'):
+                result['description'] = self._clean_html_description(str(item['description']))
+            
+            if result:
+                return result
         
         return {}
 
-    def _extract_lever_basics(self, soup) -> Dict[str, Any]:
-        """Extract basic job information using CSS selectors."""
+    def _extract_lever_basics(self, tree, skip: frozenset = frozenset()) -> Dict[str, Any]:
+        """Extract basic job information using CSS selectors (fields in ``skip`` are not looked up)."""
         result = {}
+        fields = _BASIC_FIELDS - skip
         
         # Title
-        for selector in self.lever_selectors['title']:
-            element = soup.select_one(selector)
-            if element and element.get_text(strip=True):
-                result['title'] = element.get_text(strip=True)
-                break
+        if 'title' in fields:
+            for _, element in _field_candidates(tree, 'title'):
+                text = element.text(strip=True)
+                if text:
+                    result['title'] = text
+                    break
         
         # Company (from logo alt text or header)
-        for selector in self.lever_selectors['company']:
-            if '@' in selector:
-                sel, attr = selector.split('@')
-                element = soup.select_one(sel)
-                if element and element.get(attr):
-                    # Clean company name from logo alt text
-                    company = element.get(attr).replace(' logo', '').replace(' Logo', '').strip()
-                    if company and len(company) > 2:
-                        result['company'] = company
+        if 'company' in fields:
+            for attr, element in _field_candidates(tree, 'company'):
+                if attr:
+                    value = element.attributes.get(attr)
+                    if value:
+                        # Clean company name from logo alt text
+                        company = value.replace(' logo', '').replace(' Logo', '').strip()
+                        if company and len(company) > 2:
+                            result['company'] = company
+                            break
+                else:
+                    text = element.text(strip=True)
+                    if text:
+                        result['company'] = text
                         break
-            else:
-                element = soup.select_one(selector)
-                if element and element.get_text(strip=True):
-                    result['company'] = element.get_text(strip=True)
-                    break
         
         # Location
-        for selector in self.lever_selectors['location']:
-            element = soup.select_one(selector)
-            if element and element.get_text(strip=True):
-                location = element.get_text(strip=True)
-                # Clean location text
-                location = re.sub(r'^(Location:|Loc:)\s*', '', location, flags=re.IGNORECASE)
-                if location and len(location) > 2:
-                    result['location'] = location
-                    break
+        if 'location' in fields:
+            for _, element in _field_candidates(tree, 'location'):
+                location = element.text(strip=True)
+                if location:
+                    # Clean location text
+                    location = re.sub(r'^(Location:|Loc:)\s*', '', location, flags=re.IGNORECASE)
+                    if location and len(location) > 2:
+                        result['location'] = location
+                        break
         
         # Department
-        for selector in self.lever_selectors['department']:
-            element = soup.select_one(selector)
-            if element and element.get_text(strip=True):
-                dept = element.get_text(strip=True).rstrip(' /')
-                if dept and len(dept) > 1:
-                    result['department'] = dept
-                    break
+        for _, element in _field_candidates(tree, 'department'):
+            dept = element.text(strip=True).rstrip(' /')
+            if dept and len(dept) > 1:
+                result['department'] = dept
+                break
         
         # Employment Type
-        for selector in self.lever_selectors['employment_type']:
-            element = soup.select_one(selector)
-            if element and element.get_text(strip=True):
-                emp_type = element.get_text(strip=True).rstrip(' /')
-                if emp_type and len(emp_type) > 2:
-                    result['employment_type'] = emp_type.lower().replace(' ', '-')
-                    break
+        for _, element in _field_candidates(tree, 'employment_type'):
+            emp_type = element.text(strip=True).rstrip(' /')
+            if emp_type and len(emp_type) > 2:
+                result['employment_type'] = emp_type.lower().replace(' ', '-')
+                break
         
         # Workplace Type
-        for selector in self.lever_selectors['workplace_type']:
-            element = soup.select_one(selector)
-            if element and element.get_text(strip=True):
-                workplace = element.get_text(strip=True)
-                if workplace and len(workplace) > 2:
-                    result['workplace_type'] = workplace.lower()
-                    break
+        for _, element in _field_candidates(tree, 'workplace_type'):
+            workplace = element.text(strip=True)
+            if workplace and len(workplace) > 2:
+                result['workplace_type'] = workplace.lower()
+                break
         
         return result
 
-    def _extract_lever_sections(self, soup) -> Dict[str, Any]:
+    def _extract_lever_sections(self, tree) -> Dict[str, Any]:
         """Extract detailed job sections like responsibilities, requirements, etc."""
         result = {}
         
         # Find all section containers
-        sections = soup.find_all('div', class_='section page-centered')
+        sections = tree.css('div[class="section page-centered"]')
         
         for section in sections:
             # Look for h3 headings to identify section types
-            heading = section.find('h3')
-            if not heading:
+            heading, content_div = _section_parts(section)
+            if not heading or not content_div:
                 continue
             
-            heading_text = heading.get_text(strip=True).lower()
-            content_div = heading.find_next_sibling(['div', 'ul'])
-            
-            if not content_div:
-                continue
+            heading_text = heading.text(strip=True).lower()
             
             # Extract list items if present
-            list_items = content_div.find_all('li')
+            list_items = content_div.css('li')
             if list_items:
-                items = [li.get_text(strip=True) for li in list_items if li.get_text(strip=True)]
+                items = [text for text in (li.text(strip=True) for li in list_items) if text]
                 
-                if 'responsibilit' in heading_text or 'what you' in heading_text:
-                    result['responsibilities'] = items
-                elif 'require' in heading_text or 'qualif' in heading_text:
-                    result['requirements'] = items
-                elif 'benefit' in heading_text or 'what we offer' in heading_text:
-                    result['benefits'] = items
-                elif 'value' in heading_text or 'what we value' in heading_text:
-                    result['values'] = items
+                field = _keyword_field(heading_text, _SECTION_LIST_FIELDS)
+                if field:
+                    result[field] = items
             else:
                 # Extract plain text content
-                content = content_div.get_text(strip=True)
+                content = content_div.text(strip=True)
                 if content and len(content) > 20:
-                    if 'responsibilit' in heading_text:
-                        result['responsibilities_text'] = content
-                    elif 'require' in heading_text:
-                        result['requirements_text'] = content
-                    elif 'benefit' in heading_text:
-                        result['benefits_text'] = content
+                    field = _keyword_field(heading_text, _SECTION_TEXT_FIELDS)
+                    if field:
+                        result[field] = content
         
         return result
 
-    def _extract_lever_salary(self, soup) -> Dict[str, Any]:
+    def _extract_lever_salary(self, tree) -> Dict[str, Any]:
         """Extract salary information from the posting."""
         result = {}
         
-        # Look for salary in closing description or any div containing salary info
-        salary_containers = soup.find_all(['div', 'p'], string=re.compile(r'\$.*year', re.IGNORECASE))
-        
-        for container in salary_containers:
-            text = container.get_text()
+        # One scan of the page text instead of probing every div/p for salary wording
+        body = tree.body or tree.root
+        if body is None:
+            return result
+        salary_match = _SALARY_RANGE_RE.search(body.text(separator=' '))
+        if salary_match:
+            min_salary = salary_match.group(1).replace(',', '')
+            max_salary = salary_match.group(2).replace(',', '')
             
-            # Try to extract salary range
-            salary_match = re.search(self.lever_patterns['salary_range'], text, re.IGNORECASE)
-            if salary_match:
-                min_salary = salary_match.group(1).replace(',', '')
-                max_salary = salary_match.group(2).replace(',', '')
-                
-                result['salary'] = {
-                    'min': int(min_salary),
-                    'max': int(max_salary),
-                    'currency': 'USD',
-                    'period': 'yearly',
-                    'raw_text': salary_match.group(0)
-                }
-                break
+            result['salary'] = {
+                'min': int(min_salary),
+                'max': int(max_salary),
+                'currency': 'USD',
+                'period': 'yearly',
+                'raw_text': salary_match.group(0)
+            }
         
         return result
 
-    def _extract_lever_links(self, soup, base_url: str) -> Dict[str, List[Dict[str, str]]]:
+    def _extract_lever_links(self, tree, base_url: str) -> Dict[str, List[Dict[str, str]]]:
         """Extract and categorize all relevant links from the posting."""
         links = {
             'apply': [],
@@ -350,30 +430,35 @@ class LeverJobExtractor:
             'external': []
         }
         
-        all_links = soup.find_all('a', href=True)
+        all_links = tree.css('a[href]')
         seen: set[str] = set()
         
         # Determine company slug from URL path (jobs.lever.co/<slug>/...)
+        # and the origin that root-relative hrefs are resolved against
         company_slug = None
+        scheme, origin = 'https', ''
         try:
-            from urllib.parse import urlparse
             parsed = urlparse(base_url)
             parts = [p for p in parsed.path.split('/') if p]
             if parts:
                 company_slug = parts[0].lower()
+            scheme = parsed.scheme or scheme
+            origin = f"{scheme}://{parsed.netloc}"
         except Exception:
             company_slug = None
         
         for link in all_links:
-            href = (link.get('href') or '').strip()
-            text = link.get_text(strip=True)
+            href = (link.attributes.get('href') or '').strip()
+            text = link.text(strip=True)
             
             if not href or href.startswith('#'):
                 continue
             
             # Convert relative URLs to absolute
-            if href.startswith('/'):
-                href = urljoin(base_url, href)
+            if href.startswith('//'):
+                href = f"{scheme}:{href}"
+            elif href.startswith('/'):
+                href = origin + href
             
             # De-duplicate by URL
             key = href
@@ -411,12 +496,7 @@ class LeverJobExtractor:
             return 'email'
         elif 'tel:' in href:
             return 'phone'
-        elif any(word in text_lower for word in ['career', 'life at', 'culture', 'about']):
-            return 'company_info'
-        elif any(word in text_lower for word in ['benefit', 'compensation', 'package']):
-            return 'benefits'
-        else:
-            return 'general'
+        return _keyword_field(text_lower, _LINK_TEXT_TYPES) or 'general'
 
     def _clean_html_description(self, html_desc: str) -> str:
         """Clean HTML description while preserving structure."""
@@ -424,13 +504,12 @@ class LeverJobExtractor:
             return ""
         
         try:
-            from bs4 import BeautifulSoup
-            soup = BeautifulSoup(html_desc, 'html.parser')
+            tree = LexborHTMLParser(html_desc)
             
             # Convert links to readable format
-            for link in soup.find_all('a', href=True):
-                href = link.get('href')
-                text = link.get_text(strip=True)
+            for link in tree.css('a[href]'):
+                href = link.attributes.get('href')
+                text = link.text(strip=True)
                 
                 if text and href and text.lower() != href.lower():
                     link.replace_with(f"{text} ({href})")
@@ -440,23 +519,23 @@ class LeverJobExtractor:
                     link.replace_with(text)
             
             # Convert to text with proper formatting
-            text = soup.get_text('\n', strip=True)
+            text = tree.text(separator='\n', strip=True)
             
             # Normalize unicode whitespace
-            text = re.sub(r'[\u00A0\u2000-\u200B\u202F\u205F\u3000]', ' ', text)
+            text = text.translate(_WS_TABLE)
             # Clean up extra whitespace
-            text = re.sub(r'\n\s*\n\s*\n', '\n\n', text)
-            text = re.sub(r' +', ' ', text)
+            text = _MULTI_NL.sub('\n\n', text)
+            text = _MULTI_SP.sub(' ', text)
             
             return text.strip()
             
         except Exception:
-            # Fallback: strip HTML tags
-            return re.sub(r'<[^>]+>', '', html_desc).strip()
+            # Fallback (also used without selectolax): strip HTML tags
+            return _TAG_RE.sub('', html_desc).strip()
 
     def _clean_lever_data(self, data: Dict[str, Any], url: str) -> Dict[str, Any]:
-        """Clean and enhance extracted data."""
-        cleaned = data.copy()
+        """Clean and enhance extracted data (mutates and returns ``data``)."""
+        cleaned = data
         
         # Add metadata
         cleaned['source_url'] = url
@@ -497,7 +576,7 @@ class LeverJobExtractor:
         return cleaned
 
     def _fallback_lever_extraction(self, html: str, url: str) -> Dict[str, Any]:
-        """Fallback extraction when BeautifulSoup is not available."""
+        """Fallback extraction when selectolax is not available."""
         result = {
             'source_url': url,
             'source_platform': 'lever',
@@ -18,10 +18,14 @@ from typing import List, Dict, Any, Optional, Iterable, Protocol, Tuple
 import re
 import json
 import asyncio
-import httpx
-from bs4 import BeautifulSoup
+import hashlib
+import threading
+from cachetools import LRUCache
+from selectolax.lexbor import LexborHTMLParser
 from readability import Document
 
+from app.utils.net import fetch_html
+
 # ---------------- LLM Client Abstractions ---------------- #
 class BaseLLMClient(Protocol):
     async def complete_json(self, prompt: str, schema_hint: str | None = None, max_retries: int = 2) -> Dict[str, Any]: ...
@@ -40,14 +44,9 @@ class MockLLMClient:
 # ---------------- Configuration Data Classes ------------- #
 @dataclass
 class FetchConfig:
+    # Passed through to net.fetch_html, which supplies rotating browser headers itself
     timeout: float = 25.0
-    headers: Dict[str, str] = field(default_factory=lambda: {
-        "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
-        "Accept-Language": "en-US,en;q=0.9",
-        "Cache-Control": "no-cache",
-        "Pragma": "no-cache",
-    })
+    tries: int = 3
 
 @dataclass
 class ExtractionResult:
@@ -59,11 +58,8 @@ class ExtractionResult:
     warnings: List[str] = field(default_factory=list)
 
 # ---------------- Fetching Layer ------------------------- #
-async def fetch_url(url: str, cfg: FetchConfig) -> str:
-    async with httpx.AsyncClient(follow_redirects=True, timeout=cfg.timeout) as client:
-        r = await client.get(url, headers=cfg.headers)
-        r.raise_for_status()
-        return r.text
+# Fetching goes through net.fetch_html (shared pooled client, retries, per-host rate limit,
+# short-lived HTML cache) so LLM extraction and the main pipelines never refetch separately.
 
 # Placeholder for future JS rendering integration
 async def render_js(url: str) -> Optional[str]:
@@ -77,6 +73,9 @@ BOILERPLATE_PATTERNS = [
     ]
 ]
 
+# All boilerplate patterns fused into one alternation so each line is scanned once
+BOILERPLATE_RE = re.compile("|".join(f"(?:{p.pattern})" for p in BOILERPLATE_PATTERNS), re.I)
+
 SECTION_HINTS = {
     "responsibilities": ["responsibilities", "what you will do", "you will", "your role"],
     "requirements": ["requirements", "what you bring", "you have", "qualifications"],
@@ -87,12 +86,54 @@ SKILL_NORMALIZATION = {
     "js": "JavaScript", "node": "Node.js", "postgres": "PostgreSQL", "k8s": "Kubernetes"
 }
 
-SKILL_PATTERN = re.compile(r"\b([A-Za-z][A-Za-z0-9+.#]{1,30})\b")
-
 COMMON_SKILLS = {
     "python","java","javascript","typescript","react","svelte","angular","vue","docker","kubernetes","k8s","aws","gcp","azure","postgres","postgresql","mysql","mongodb","redis","graphql","rest","ci","cd","ci/cd","git","linux","terraform","ansible","kafka","spark","hadoop","go","golang","ruby","php","c#","c++","scala","swift","kotlin"
 }
 
+# One alternation over COMMON_SKILLS (longest first) scanned across the text, instead of
+# tokenizing every word; the custom boundaries keep "c++", "c#" and "ci/cd" whole
+_SKILL_RE = re.compile(
+    r"(?<![A-Za-z0-9+.#])("
+    + "|".join(re.escape(s) for s in sorted(COMMON_SKILLS, key=len, reverse=True))
+    + r")(?![A-Za-z0-9+#]|\.[A-Za-z0-9])",
+    re.I,
+)
+
+# Top-level keys of the structured payload the prompts ask for
+_STRUCTURED_KEYS = (
+    "job_title", "main_responsibilities", "key_skills_and_qualifications",
+    "experience_requirements", "other_relevant_details",
+)
+
+# Noise tags plus elements whose class marks page chrome (cookie bars, popups, signup boxes);
+# one selector group lets Lexbor pick them all without a Python pass over every node
+_JUNK_SELECTOR = ", ".join(
+    ["script", "style", "nav", "header", "footer", "aside", "form", "noscript"]
+    + [f"[class*={k} i]" for k in ("cookie", "banner", "subscribe", "newsletter", "modal")]
+)
+
+# A lone <main>/<article> with at least this much text is used as-is instead of readability
+_MIN_MAIN_REGION_TEXT = 500
+
+_RE_EXPERIENCE = re.compile(r'(\d+\+?\s*(?:years|yrs))', re.I)
+_RE_EXPERIENCE_IN_TEXT = re.compile(r'(\d+\+?\s*(?:years|yrs) of experience)', re.I)
+
+# blake2b(html) -> (raw_text, cleaned_text) from _extract_main_text
+_MAIN_TEXT_CACHE: LRUCache = LRUCache(maxsize=256)
+_MAIN_TEXT_CACHE_LOCK = threading.Lock()
+
+# The schema hints are static, so they are serialized once instead of on every prompt
+_SCHEMA = {
+    "job_title": "string",
+    "main_responsibilities": ["string"],
+    "key_skills_and_qualifications": ["string"],
+    "experience_requirements": "string",
+    "other_relevant_details": "string"
+}
+SCHEMA_HINT_JSON = json.dumps(_SCHEMA, indent=2)
+BATCH_SCHEMA_HINT_JSON = json.dumps({"<id>": _SCHEMA}, indent=2)
+
+
 # ---------------- Core Extractor ------------------------- #
 class LLMJobExtractor:
     def __init__(self, llm: Optional[BaseLLMClient] = None, fetch_cfg: Optional[FetchConfig] = None) -> None:
@@ -104,20 +145,53 @@ class LLMJobExtractor:
         raw_main, cleaned = self._extract_main_text(html)
         prompt = self._build_prompt(cleaned[:18000])  # truncate to stay in context
         structured = await self.llm.complete_json(prompt)
-        structured = self._validate_and_normalize(structured, cleaned)
-        return ExtractionResult(
-            source_url=url,
-            raw_text=raw_main,
-            cleaned_text=cleaned,
-            structured=structured,
-            model=self.llm.__class__.__name__,
-            warnings=structured.pop("_warnings", [])
-        )
+        return self._to_result(url, raw_main, cleaned, structured)
+
+    async def extract_many(self, urls: List[str], concurrency: int = 8) -> List[ExtractionResult | BaseException]:
+        """Run extract_from_url over many URLs with at most `concurrency` in flight.
+
+        Results keep the input order; a failed URL yields its exception instead of aborting the batch.
+        """
+        sem = asyncio.Semaphore(max(1, concurrency))
+
+        async def _one(u: str) -> ExtractionResult:
+            async with sem:
+                return await self.extract_from_url(u)
+
+        return await asyncio.gather(*(_one(u) for u in urls), return_exceptions=True)
 
     async def extract_from_html(self, url: str, html: str) -> ExtractionResult:
         raw_main, cleaned = self._extract_main_text(html)
         prompt = self._build_prompt(cleaned[:18000])
         structured = await self.llm.complete_json(prompt)
+        return self._to_result(url, raw_main, cleaned, structured)
+
+    async def extract_batch(self, items: List[Tuple[str, str]], batch_size: int = 8,
+                            char_budget: int = 18000) -> List[ExtractionResult]:
+        """Extract several (url, html) pairs with one LLM call per chunk of `batch_size` docs.
+
+        The prompt budget is split evenly across the docs in a chunk. Any doc whose entry is
+        missing or malformed in the batch reply falls back to a single-doc call.
+        """
+        texts = [(url, *self._extract_main_text(html)) for url, html in items]
+        results: List[ExtractionResult] = []
+        step = max(1, batch_size)
+        for start in range(0, len(texts), step):
+            chunk = texts[start:start + step]
+            per_doc = char_budget // len(chunk)
+            prompt = self._build_batch_prompt([(str(i), cleaned[:per_doc]) for i, (_, _, cleaned) in enumerate(chunk)])
+            try:
+                batch = await self.llm.complete_json(prompt)
+            except Exception:
+                batch = {}
+            for i, (url, raw_main, cleaned) in enumerate(chunk):
+                entry = batch.get(str(i)) if isinstance(batch, dict) else None
+                if not isinstance(entry, dict) or not any(k in entry for k in _STRUCTURED_KEYS):
+                    entry = await self.llm.complete_json(self._build_prompt(cleaned[:18000]))
+                results.append(self._to_result(url, raw_main, cleaned, entry))
+        return results
+
+    def _to_result(self, url: str, raw_main: str, cleaned: str, structured: Dict[str, Any]) -> ExtractionResult:
         structured = self._validate_and_normalize(structured, cleaned)
         return ExtractionResult(
             source_url=url,
@@ -129,7 +203,7 @@ class LLMJobExtractor:
         )
 
     async def _obtain_html(self, url: str) -> str:
-        html = await fetch_url(url, self.fetch_cfg)
+        html, _ = await fetch_html(url, timeout=self.fetch_cfg.timeout, tries=self.fetch_cfg.tries)
         if self._looks_incomplete(html):
             rendered = await render_js(url)
             if rendered:
@@ -144,48 +218,65 @@ class LLMJobExtractor:
         return False
 
     def _extract_main_text(self, html: str) -> Tuple[str, str]:
-        doc = Document(html)
-        main_html = doc.summary(html_partial=True)
-        soup = BeautifulSoup(main_html, 'html.parser')
-        for tag in soup(['script','style','nav','header','footer','aside','form','noscript']):
-            tag.decompose()
-        # Remove cookie & banner nodes
-        for div in soup.find_all(True):
-            cls = ' '.join(div.get('class', [])).lower()
-            if any(k in cls for k in ['cookie','banner','subscribe','newsletter','modal']):
-                div.decompose()
-        text = soup.get_text('\n', strip=True)
+        # Retries, refreshes and syndicated copies re-send identical HTML; the (raw, cleaned)
+        # pair depends only on the content, so reuse it by digest
+        key = hashlib.blake2b(html.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        with _MAIN_TEXT_CACHE_LOCK:
+            cached = _MAIN_TEXT_CACHE.get(key)
+        if cached is None:
+            cached = self._extract_main_text_uncached(html)
+            with _MAIN_TEXT_CACHE_LOCK:
+                _MAIN_TEXT_CACHE[key] = cached
+        return cached
+
+    def _extract_main_text_uncached(self, html: str) -> Tuple[str, str]:
+        main_html = self._single_main_region(html)
+        if main_html is None:
+            main_html = Document(html).summary(html_partial=True)
+        tree = LexborHTMLParser(main_html)
+        # Drop noise tags and cookie/banner nodes in one query; reversed document order
+        # decomposes descendants before their ancestors
+        for node in reversed(tree.css(_JUNK_SELECTOR)):
+            node.decompose()
+        root = tree.body or tree.root
+        pieces = root.text(separator='\x00').split('\x00') if root is not None else []
+        text = '\n'.join(p for p in (piece.strip() for piece in pieces) if p)
         lines = [l.strip() for l in text.split('\n') if l.strip()]
-        filtered = [l for l in lines if not any(p.search(l) for p in BOILERPLATE_PATTERNS)]
+        filtered = [l for l in lines if not BOILERPLATE_RE.search(l)]
         cleaned = self._merge_short_lines(filtered)
         return text, cleaned
 
+    def _single_main_region(self, html: str) -> Optional[str]:
+        """Outer HTML of the page's only <main> (or only <article>) when it holds enough text.
+
+        Such pages already mark their content region, so readability's scoring pass is skipped.
+        """
+        tree = LexborHTMLParser(html)
+        for selector in ('main', 'article'):
+            nodes = tree.css(selector)
+            if len(nodes) == 1:
+                if len(nodes[0].text(separator=' ', strip=True)) >= _MIN_MAIN_REGION_TEXT:
+                    return nodes[0].html
+                return None
+        return None
+
     def _merge_short_lines(self, lines: List[str]) -> str:
         buf: List[str] = []
-        acc = ''
+        acc: List[str] = []  # run of short lines, joined once on flush
         for line in lines:
             if len(line) < 60:
-                if acc:
-                    acc += (' ' + line)
-                else:
-                    acc = line
+                acc.append(line)
             else:
                 if acc:
-                    buf.append(acc)
-                    acc = ''
+                    buf.append(' '.join(acc))
+                    acc.clear()
                 buf.append(line)
         if acc:
-            buf.append(acc)
+            buf.append(' '.join(acc))
         return '\n'.join(buf)
 
     def _build_prompt(self, content: str) -> str:
-        schema_hint = json.dumps({
-            "job_title": "string",
-            "main_responsibilities": ["string"],
-            "key_skills_and_qualifications": ["string"],
-            "experience_requirements": "string",
-            "other_relevant_details": "string"
-        }, indent=2)
+        schema_hint = SCHEMA_HINT_JSON
         return (
             "You are an expert recruiting analyst. Extract ONLY job-relevant information from the provided text.\n"
             "Ignore company history, ads, cookie notices, unrelated disclaimers.\n"
@@ -194,6 +285,19 @@ class LLMJobExtractor:
             "If a field is missing, use an empty string or empty array. Do not invent details.\n\n"
             f"TEXT:\n{content}\n\nSCHEMA_HINT:\n{schema_hint}\nOUTPUT JSON:" )
 
+    def _build_batch_prompt(self, docs: List[Tuple[str, str]]) -> str:
+        schema_hint = BATCH_SCHEMA_HINT_JSON
+        blocks = "".join(f"--- DOC id={doc_id} ---\n{content}\n" for doc_id, content in docs)
+        return (
+            "You are an expert recruiting analyst. Each DOC below is a separate job posting. "
+            "Extract ONLY job-relevant information from each one independently.\n"
+            "Ignore company history, ads, cookie notices, unrelated disclaimers.\n"
+            "Return VALID minified JSON: an object keyed by DOC id, each value having keys: job_title, "
+            "main_responsibilities (array), key_skills_and_qualifications (array), "
+            "experience_requirements (string), other_relevant_details (string).\n"
+            "If a field is missing, use an empty string or empty array. Do not invent details.\n\n"
+            f"{blocks}\nSCHEMA_HINT:\n{schema_hint}\nOUTPUT JSON:" )
+
     def _validate_and_normalize(self, data: Dict[str, Any], cleaned_text: str) -> Dict[str, Any]:
         warnings: List[str] = []
         # Guarantee keys
@@ -215,32 +319,35 @@ class LLMJobExtractor:
             if not isinstance(s, str):
                 continue
             base = s.strip()
-            low = base.lower()
-            if low in SKILL_NORMALIZATION:
-                base = SKILL_NORMALIZATION[low]
+            # lowercase once; only a normalized replacement needs its own key
+            key = base.lower()
+            if key in SKILL_NORMALIZATION:
+                base = SKILL_NORMALIZATION[key]
+                key = base.lower()
             # quick filter for plausible skill tokens in fallback
             if len(base) > 60:
                 continue
-            if base.lower() in seen:
+            if key in seen:
                 continue
-            seen.add(base.lower())
+            seen.add(key)
             norm_skills.append(base)
         # Fallback: mine skills from cleaned text if list too small
         if len(norm_skills) < 3:
             mined = self._mine_skills(cleaned_text)
             for m in mined:
-                if m.lower() not in seen:
+                key = m.lower()
+                if key not in seen:
                     norm_skills.append(m)
-                    seen.add(m.lower())
+                    seen.add(key)
                     if len(norm_skills) >= 12:
                         break
         data['key_skills_and_qualifications'] = norm_skills
         # Basic experience normalization
         exp = data.get('experience_requirements') or ''
-        m = re.search(r'(\d+\+?\s*(?:years|yrs))', exp, re.I)
-        if not m:
-            # Try to find in text
-            m2 = re.search(r'(\d+\+?\s*(?:years|yrs) of experience)', cleaned_text, re.I)
+        m = _RE_EXPERIENCE.search(exp) if exp else None
+        # Try to find in text; a substring check rules out most texts before the regex scan
+        if not m and 'of experience' in cleaned_text.lower():
+            m2 = _RE_EXPERIENCE_IN_TEXT.search(cleaned_text)
             if m2:
                 data['experience_requirements'] = m2.group(1)
                 warnings.append('derived_experience')
@@ -249,17 +356,17 @@ class LLMJobExtractor:
 
     def _mine_skills(self, text: str) -> List[str]:
         found = set()
-        for tok in SKILL_PATTERN.findall(text):
+        for m in _SKILL_RE.finditer(text):
+            tok = m.group(1)
             low = tok.lower()
-            if low in COMMON_SKILLS:
-                if low in SKILL_NORMALIZATION:
-                    found.add(SKILL_NORMALIZATION[low])
+            if low in SKILL_NORMALIZATION:
+                found.add(SKILL_NORMALIZATION[low])
+            else:
+                # Title-case certain multi-case tokens
+                if low in {"aws","gcp","sql","git","rest","ci","cd","ci/cd"}:
+                    found.add(low.upper())
                 else:
-                    # Title-case certain multi-case tokens
-                    if low in {"aws","gcp","sql","git","rest","ci","cd"}:
-                        found.add(low.upper())
-                    else:
-                        found.add(tok if any(c.isupper() for c in tok[1:]) else tok.capitalize())
+                    found.add(tok if any(c.isupper() for c in tok[1:]) else tok.capitalize())
             if len(found) >= 30:
                 break
         return sorted(found)
@@ -1,15 +1,26 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
+from functools import lru_cache
 import os
 import random
 import re
 from typing import Dict, Optional, Tuple
 import time
+from urllib.parse import urlparse
 
 import httpx
+from cachetools import TTLCache
 
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
 
-UA_POOL = [
+
+UA_POOL = (
     # Realistic, varied desktop UA strings for better bot evasion
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
@@ -19,15 +30,55 @@ UA_POOL = [
     "Mozilla/5.0 (X11; Linux x86_64; rv:125.0) Gecko/20100101 Firefox/125.0",
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:125.0) Gecko/20100101 Firefox/125.0",
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:125.0) Gecko/20100101 Firefox/125.0",
-]
+)
+
+
+# Shared pooled client for direct fetches; keep-alive connections skip repeat TCP/TLS handshakes
+_CLIENT: Optional[httpx.AsyncClient] = None
+
+
+def get_client() -> httpx.AsyncClient:
+    global _CLIENT
+    if _CLIENT is None or _CLIENT.is_closed:
+        _CLIENT = httpx.AsyncClient(
+            http2=_HTTP2,
+            timeout=25.0,
+            follow_redirects=True,
+            limits=httpx.Limits(max_keepalive_connections=50, max_connections=100),
+        )
+    return _CLIENT
+
+
+async def aclose_client() -> None:
+    """Close the shared HTTP client (call on application shutdown)."""
+    global _CLIENT
+    if _CLIENT is not None:
+        await _CLIENT.aclose()
+        _CLIENT = None
+
+
+# Per-process best-effort state for fetch_html; both are size-bounded and expire on their own.
+# url -> (html, status), reused for 10s
+_HTML_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=10)
+# host -> time.time() of the last successful fetch; older than the interval means no wait
+_HOST_MIN_INTERVAL = 1.5
+_RATE_LIMIT: TTLCache = TTLCache(maxsize=4096, ttl=_HOST_MIN_INTERVAL)
 
 
-def _parse_proxy_pool(env_var: str = "PROXY_URLS") -> list[str]:
+_RE_PROXY_SPLIT = re.compile(r"[\s,]+")
+
+
+@lru_cache(maxsize=16)
+def _split_proxy_urls(raw: str) -> tuple[str, ...]:
+    return tuple(p for p in _RE_PROXY_SPLIT.split(raw) if p)
+
+
+def _parse_proxy_pool(env_var: str = "PROXY_URLS") -> tuple[str, ...]:
     raw = os.getenv(env_var, "").strip()
     if not raw:
-        return []
-    parts = re.split(r"[\s,]+", raw)
-    return [p for p in parts if p]
+        return ()
+    # The env value rarely changes, so the split is memoized on the raw string
+    return _split_proxy_urls(raw)
 
 
 def choose_proxy() -> Optional[str]:
@@ -37,23 +88,24 @@ def choose_proxy() -> Optional[str]:
     return random.choice(pool)
 
 
+# Vary accept headers slightly to look more natural
+_ACCEPT_VARIATIONS = (
+    "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
+    "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8",
+    "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+)
+_LANG_VARIATIONS = (
+    "en-US,en;q=0.9",
+    "en-US,en;q=0.8,fr;q=0.6",
+    "en-US,en;q=0.9,es;q=0.8",
+)
+
+
 def random_headers() -> Dict[str, str]:
-    ua = random.choice(UA_POOL)
-    # Vary accept headers slightly to look more natural
-    accept_variations = [
-        "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
-        "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,image/apng,*/*;q=0.8",
-        "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-    ]
-    lang_variations = [
-        "en-US,en;q=0.9",
-        "en-US,en;q=0.8,fr;q=0.6",
-        "en-US,en;q=0.9,es;q=0.8",
-    ]
     return {
-        "User-Agent": ua,
-        "Accept": random.choice(accept_variations),
-        "Accept-Language": random.choice(lang_variations),
+        "User-Agent": random.choice(UA_POOL),
+        "Accept": random.choice(_ACCEPT_VARIATIONS),
+        "Accept-Language": random.choice(_LANG_VARIATIONS),
         "Accept-Encoding": "gzip, deflate, br",
         "DNT": "1",
         "Connection": "keep-alive",
@@ -82,64 +134,64 @@ async def fetch_html(url: str, *, timeout: float = 25.0, tries: int = 3, follow_
 
     # Simple in-process per-host rate limiting and short TTL cache
     # Note: this is per-process best-effort; for multi-worker, consider Redis keys
-    from urllib.parse import urlparse
     parsed = urlparse(url)
     host = parsed.netloc
     now = time.time()
-    # Basic rate limiting state (module-level singletons)
-    global _RATE_LIMIT, _HTML_CACHE
-    try:
-        _RATE_LIMIT
-    except NameError:
-        _RATE_LIMIT = {}
-    try:
-        _HTML_CACHE
-    except NameError:
-        _HTML_CACHE = {}
-    # Cache lookup (10s TTL)
+    # Cache lookup (entries expire after 10s)
     cache_entry = _HTML_CACHE.get(url)
-    if cache_entry and (now - cache_entry[0] < 10):
-        return cache_entry[1], cache_entry[2]
+    if cache_entry:
+        return cache_entry
     # Per-host min interval 1.5s between requests
     last_hit = _RATE_LIMIT.get(host, 0)
-    delay = 1.5 - max(0.0, now - last_hit)
+    delay = _HOST_MIN_INTERVAL - max(0.0, now - last_hit)
     if delay > 0:
-        import asyncio
         await asyncio.sleep(delay)
     
-    for attempt in range(max(1, tries)):
-        headers = random_headers()
-        # Add slight delay between attempts to avoid rate limiting
-        if attempt > 0:
-            import asyncio
-            await asyncio.sleep(random.uniform(1.0, 3.0))
-        
-        try:
-            proxy = choose_proxy()
-            async with httpx.AsyncClient(
-                timeout=timeout, 
-                follow_redirects=follow_redirects,
-                limits=httpx.Limits(max_keepalive_connections=5, max_connections=10),
-            ) as client:
-                req_kwargs = {"headers": headers}
+    # Proxied attempts need a client bound to that proxy; each one is opened at most once per
+    # call, reused if the rotation picks the same proxy again, and closed when the call ends
+    async with contextlib.AsyncExitStack() as stack:
+        proxy_clients: Dict[str, httpx.AsyncClient] = {}
+        for attempt in range(max(1, tries)):
+            headers = random_headers()
+            # Add slight delay between attempts to avoid rate limiting
+            if attempt > 0:
+                await asyncio.sleep(random.uniform(1.0, 3.0))
+
+            try:
+                proxy = choose_proxy()
                 if proxy:
-                    req_kwargs["proxies"] = proxy
-                resp = await client.get(url, **req_kwargs)
-
-            last_status = resp.status_code
-            html = resp.text
-
-            # Accept any response with usable HTML, even if status isn't perfect
-            if resp.is_success or _has_usable_html(html):
-                # update caches
-                _HTML_CACHE[url] = (time.time(), html, last_status)
-                _RATE_LIMIT[host] = time.time()
-                return html, last_status
-
-        except Exception as e:
-            last_error = e
-            continue
-    
+                    client = proxy_clients.get(proxy)
+                    if client is None:
+                        # Proxy URL strings on the transport need httpx>=0.26 (pyproject floor)
+                        client = await stack.enter_async_context(httpx.AsyncClient(
+                            timeout=timeout,
+                            follow_redirects=follow_redirects,
+                            transport=httpx.AsyncHTTPTransport(
+                                proxy=proxy,
+                                limits=httpx.Limits(max_keepalive_connections=5, max_connections=10),
+                            ),
+                        ))
+                        proxy_clients[proxy] = client
+                    resp = await client.get(url, headers=headers)
+                else:
+                    resp = await get_client().get(
+                        url, headers=headers, timeout=timeout, follow_redirects=follow_redirects
+                    )
+
+                last_status = resp.status_code
+                html = resp.text
+
+                # Accept any response with usable HTML, even if status isn't perfect
+                if resp.is_success or _has_usable_html(html):
+                    # update caches
+                    _HTML_CACHE[url] = (html, last_status)
+                    _RATE_LIMIT[host] = time.time()
+                    return html, last_status
+
+            except Exception as e:
+                last_error = e
+                continue
+
     # If we exhausted retries
     if last_error:
         raise last_error
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import List, Dict, Tuple
 import re
-from bs4 import BeautifulSoup, NavigableString, Tag
+from selectolax.lexbor import LexborHTMLParser, LexborNode
 
 
 HEADING_ALIASES: Dict[str, str] = {
@@ -19,6 +19,21 @@ HEADING_ALIASES: Dict[str, str] = {
     r"^(what we value|our values|values)$": "Values",
 }
 
+# Compiled once; _alias_heading tries them in declaration order
+_HEADING_ALIASES_COMPILED: List[Tuple[re.Pattern[str], str]] = [
+    (re.compile(pattern, re.I), norm) for pattern, norm in HEADING_ALIASES.items()
+]
+
+# \r -> \n, nbsp/tab -> space in one pass; only runs of spaces are left for the regex
+_SPACE_TABLE = str.maketrans({"\r": "\n", "\u00a0": " ", "\t": " "})
+_RE_SPACES = re.compile(r" {2,}")
+_RE_MULTI_NL = re.compile(r"\n{3,}")
+_RE_BLANK_LINES = re.compile(r"\n\s*\n+")
+_RE_TAG = re.compile(r"<[^>]+>")
+_RE_LIST_ITEM = re.compile(r"^\s*(?:[-*•]|\d+[\.)])\s+")
+_RE_LIST_ITEM_PARTS = re.compile(r"^\s*(?:[-*•]|(\d+)[\.)])\s+(.*)$")
+_RE_SENTENCE_END = re.compile(r"[.?!]$")
+
 ORDER = [
     "Overview",
     "Responsibilities",
@@ -33,24 +48,35 @@ ORDER = [
 
 
 def _normalize_spaces(s: str) -> str:
-    s = s.replace('\r', '\n')
-    s = re.sub(r"\u00a0", " ", s)  # nbsp
-    s = re.sub(r"[\t ]+", " ", s)
-    s = re.sub(r"\n{3,}", "\n\n", s)
+    s = s.translate(_SPACE_TABLE)
+    s = _RE_SPACES.sub(" ", s)
+    s = _RE_MULTI_NL.sub("\n\n", s)
     return s.strip()
 
 
 def _alias_heading(text: str) -> str | None:
     t = text.strip().lower().rstrip(' :')
-    for pattern, norm in HEADING_ALIASES.items():
-        if re.match(pattern, t, flags=re.I):
+    for pattern, norm in _HEADING_ALIASES_COMPILED:
+        if pattern.match(t):
             return norm
     return None
 
 
+def _node_text(node: LexborNode, sep: str) -> str:
+    """Stripped, non-empty descendant strings joined by `sep`; script/style text is skipped."""
+    if node.css_first("script, style") is None:
+        pieces = node.text(separator="\x00").split("\x00")
+    else:
+        pieces = [
+            n.text_content or "" for n in node.traverse(include_text=True)
+            if n.tag == "-text" and n.parent is not None and n.parent.tag not in ("script", "style")
+        ]
+    return sep.join(p for p in (piece.strip() for piece in pieces) if p)
+
+
 def html_to_text_preserve_lists(html: str) -> str:
     """Convert HTML to plain text while preserving list bullets and paragraph/heading separation."""
-    soup = BeautifulSoup(html, 'html.parser')
+    tree = LexborHTMLParser(html)
 
     lines: List[str] = []
 
@@ -64,73 +90,83 @@ def html_to_text_preserve_lists(html: str) -> str:
             if part:
                 lines.append(part)
 
-    def walk(node: Tag | NavigableString):
-        if isinstance(node, NavigableString):
-            text = str(node)
+    def visit(node: LexborNode) -> bool:
+        """Emit lines for one node; True when its children should be visited too."""
+        name = node.tag
+        if name == "-text":
+            text = node.text_content
             if text and text.strip():
                 emit(text)
-            return
-        if not isinstance(node, Tag):
-            return
+            return False
+        if name.startswith("-") or name.startswith("!"):
+            # comments, doctype
+            return False
 
-        name = node.name.lower()
         if name in {"script", "style", "noscript"}:
-            return
+            return False
 
         if name in {"h1", "h2", "h3", "h4", "h5", "h6"}:
-            heading_text = node.get_text(" ", strip=True)
+            heading_text = _node_text(node, " ")
             if heading_text:
                 lines.append("")
                 lines.append(heading_text.strip())
                 lines.append("")
-            return
+            return False
 
         if name in {"br"}:
             lines.append("")
-            return
+            return False
 
         if name in {"ul", "ol"}:
             is_ol = name == "ol"
             i = 1
-            for li in node.find_all("li", recursive=False):
-                li_text = li.get_text(" ", strip=True)
+            for li in node.iter():
+                if li.tag != "li":
+                    continue
+                li_text = _node_text(li, " ")
                 if not li_text:
                     continue
                 bullet = f"{i}. " if is_ol else "- "
                 lines.append(bullet + li_text)
                 i += 1
             lines.append("")
-            return
+            return False
 
         if name == "p":
-            p_text = node.get_text(" ", strip=True)
+            p_text = _node_text(node, " ")
             if p_text:
                 lines.append(p_text)
                 lines.append("")
-            return
+            return False
 
         # default: walk children
-        for child in node.children:
-            walk(child)
-
-    body = soup.body or soup
-    walk(body)
+        return True
+
+    # Like the html.parser tree this replaced, fragments without <body> are walked whole.
+    # Depth-first with an explicit stack (children pushed reversed to keep document order),
+    # so deep markup costs no Python recursion.
+    root = tree.body if "<body" in html.lower() else tree.root
+    stack: List[LexborNode] = [root] if root is not None else []
+    while stack:
+        node = stack.pop()
+        if visit(node):
+            stack.extend(reversed(list(node.iter(include_text=True))))
 
     # collapse extra blanks
     text = "\n".join(lines)
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = _RE_MULTI_NL.sub("\n\n", text)
     return text.strip()
 
 
 def _split_into_blocks(text: str) -> List[str]:
     # blocks separated by blank lines
     text = _normalize_spaces(text)
-    blocks = re.split(r"\n\s*\n+", text)
+    blocks = _RE_BLANK_LINES.split(text)
     return [b.strip() for b in blocks if b.strip()]
 
 
 def _is_list_block(lines: List[str]) -> bool:
-    return len(lines) > 1 and all(re.match(r"^\s*(?:[-*•]|\d+[\.)])\s+", l) for l in lines)
+    return len(lines) > 1 and all(_RE_LIST_ITEM.match(l) for l in lines)
 
 
 def normalize_jd_text(html_or_text: str) -> str:
@@ -145,7 +181,7 @@ def normalize_jd_text(html_or_text: str) -> str:
     if not html_or_text:
         return ""
 
-    has_tags = bool(re.search(r"<[^>]+>", html_or_text))
+    has_tags = bool(_RE_TAG.search(html_or_text))
     text = html_to_text_preserve_lists(html_or_text) if has_tags else _normalize_spaces(html_or_text)
 
     blocks = _split_into_blocks(text)
@@ -214,7 +250,7 @@ def normalize_jd_text(html_or_text: str) -> str:
         out_lines.append("")
 
     text_out = "\n".join(out_lines)
-    text_out = re.sub(r"\n{3,}", "\n\n", text_out).strip()
+    text_out = _RE_MULTI_NL.sub("\n\n", text_out).strip()
     return text_out
 
 
@@ -222,7 +258,7 @@ def _looks_like_heading(s: str) -> bool:
     s = s.strip()
     if not s or len(s) > 80:
         return False
-    if re.search(r"[.?!]$", s):
+    if _RE_SENTENCE_END.search(s):
         return False
     words = s.split()
     if len(words) > 10:
@@ -233,7 +269,7 @@ def _looks_like_heading(s: str) -> bool:
 def _normalize_list_lines(lines: List[str]) -> List[str]:
     out: List[str] = []
     for l in lines:
-        m = re.match(r"^\s*(?:[-*•]|(\d+)[\.)])\s+(.*)$", l)
+        m = _RE_LIST_ITEM_PARTS.match(l)
         if m:
             num = m.group(1)
             content = m.group(2) if m.group(2) is not None else ""
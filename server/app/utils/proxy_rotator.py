@@ -24,10 +24,10 @@ class FreeProxyRotator:
     async def fetch_free_proxies(self) -> List[Dict[str, str]]:
         """Fetch proxies using enhanced free sources"""
         try:
-            from .free_proxy_sources import FreeProxySources
+            from .free_proxy_sources import FreeProxySources, as_httpx_proxies
             sources = FreeProxySources()
             proxies = await sources.fetch_all_proxies()
-            return proxies[:self.max_proxies]
+            return [as_httpx_proxies(p) for p in proxies[:self.max_proxies]]
         except Exception as e:
             logger.warning(f"Enhanced proxy sources failed, using fallback: {e}")
             return await self._fetch_fallback_proxies()
@@ -1,13 +1,20 @@
 from __future__ import annotations
 
+import base64
 import json
 import os
 import time
 import uuid
-from typing import Any, Dict, Optional
+import zlib
+from typing import Any, Dict, Iterable, List, Optional
 
 import redis
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 QUEUE_KEY = "tf:crawl:queue"
@@ -18,46 +25,144 @@ JD_QUEUE_KEY = "tf:jd:queue"
 JD_JOB_PREFIX = "tf:jd:job:"
 
 
+_CLIENT: Optional[redis.Redis] = None
+
+
 def get_client() -> redis.Redis:
-    return redis.from_url(REDIS_URL, decode_responses=True)
+    """Shared Redis client; every caller reuses one connection pool."""
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = redis.Redis.from_url(
+            REDIS_URL,
+            decode_responses=True,
+            health_check_interval=30,
+            socket_keepalive=True,
+        )
+    return _CLIENT
+
+
+# Jobs are Redis hashes with one JSON-encoded value per field, so status ticks rewrite only the fields that changed.
+# Values larger than this are stored zlib-compressed as "Z" + base64 (the client decodes replies to str)
+_COMPRESS_MIN_BYTES = 1024
+_COMPRESSED_MARKER = "Z"
+
+
+def _dump(value: Any) -> str:
+    if orjson is not None:
+        body = orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+    else:
+        body = json.dumps(value, separators=(",", ":")).encode()
+    if len(body) > _COMPRESS_MIN_BYTES:
+        packed = _COMPRESSED_MARKER + base64.b64encode(zlib.compress(body)).decode("ascii")
+        if len(packed) < len(body):
+            return packed
+    return body.decode()
+
+
+def _load(raw: str) -> Any:
+    # JSON text never starts with the marker, so uncompressed values load as-is
+    if raw[0] == _COMPRESSED_MARKER:
+        return json.loads(zlib.decompress(base64.b64decode(raw[1:])))
+    return json.loads(raw)
+
+
+def _encode_fields(job: Dict[str, Any]) -> Dict[str, str]:
+    return {field: _dump(value) for field, value in job.items()}
+
+
+def _read_jobs(r: redis.Redis, keys: List[str]) -> List[Optional[Dict[str, Any]]]:
+    """HGETALL each key in one pipeline; None for missing keys.
+    Jobs written before the hash layout are JSON strings and are read with GET instead.
+    """
+    with r.pipeline(transaction=False) as pipe:
+        for key in keys:
+            pipe.hgetall(key)
+        results = pipe.execute(raise_on_error=False)
+    jobs: List[Optional[Dict[str, Any]]] = []
+    for key, res in zip(keys, results):
+        if isinstance(res, redis.ResponseError):
+            raw = r.get(key)
+            jobs.append(_load(raw) if raw else None)
+        elif isinstance(res, Exception):
+            raise res
+        else:
+            jobs.append({field: _load(value) for field, value in res.items()} if res else None)
+    return jobs
 
 
 def new_job_id() -> str:
     return uuid.uuid4().hex
 
 
-def enqueue_crawl(url: str, meta: Optional[Dict[str, Any]] = None) -> str:
-    job_id = new_job_id()
-    payload = {
-        "id": job_id,
+# Jobs queued per pipeline round-trip in bulk enqueues (two commands each)
+_PIPELINE_CHUNK = 5000
+
+
+def _crawl_payload(url: str, meta: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    now = int(time.time())
+    return {
+        "id": new_job_id(),
         "url": url,
         "status": "queued",
-        "created_at": int(time.time()),
-        "updated_at": int(time.time()),
+        "created_at": now,
+        "updated_at": now,
         "meta": meta or {},
     }
+
+
+def enqueue_crawl(url: str, meta: Optional[Dict[str, Any]] = None) -> str:
+    payload = _crawl_payload(url, meta)
+    job_id = payload["id"]
     r = get_client()
-    r.set(JOB_PREFIX + job_id, json.dumps(payload))
-    r.rpush(QUEUE_KEY, job_id)
+    # HSET + RPUSH in one round-trip
+    with r.pipeline(transaction=False) as pipe:
+        pipe.hset(JOB_PREFIX + job_id, mapping=_encode_fields(payload))
+        pipe.rpush(QUEUE_KEY, job_id)
+        pipe.execute()
     return job_id
 
 
+def enqueue_crawl_many(urls: Iterable[str], meta: Optional[Dict[str, Any]] = None) -> List[str]:
+    """Enqueue a crawl job per URL, pipelining the writes in chunks; returns job ids in input order."""
+    r = get_client()
+    job_ids: List[str] = []
+    with r.pipeline(transaction=False) as pipe:
+        pending = 0
+        for url in urls:
+            payload = _crawl_payload(url, meta)
+            job_id = payload["id"]
+            pipe.hset(JOB_PREFIX + job_id, mapping=_encode_fields(payload))
+            pipe.rpush(QUEUE_KEY, job_id)
+            job_ids.append(job_id)
+            pending += 1
+            if pending >= _PIPELINE_CHUNK:
+                pipe.execute()
+                pending = 0
+        if pending:
+            pipe.execute()
+    return job_ids
+
+
 def enqueue_jd_analysis(pipeline_id: str, url: str) -> str:
     """Enqueue a JD analysis job for a pipeline.
     Stores minimal payload in Redis and pushes to JD queue.
     """
     job_id = new_job_id()
+    now = int(time.time())
     payload = {
         "id": job_id,
         "pipeline_id": pipeline_id,
         "url": url,
         "status": "queued",
-        "created_at": int(time.time()),
-        "updated_at": int(time.time()),
+        "created_at": now,
+        "updated_at": now,
     }
     r = get_client()
-    r.set(JD_JOB_PREFIX + job_id, json.dumps(payload))
-    r.rpush(JD_QUEUE_KEY, job_id)
+    # HSET + RPUSH in one round-trip
+    with r.pipeline(transaction=False) as pipe:
+        pipe.hset(JD_JOB_PREFIX + job_id, mapping=_encode_fields(payload))
+        pipe.rpush(JD_QUEUE_KEY, job_id)
+        pipe.execute()
     return job_id
 
 
@@ -72,56 +177,106 @@ def fetch_next_job(block: bool = True, timeout: int = 5) -> Optional[Dict[str, A
         job_id = r.lpop(QUEUE_KEY)
         if not job_id:
             return None
-    raw = r.get(JOB_PREFIX + job_id)
-    if not raw:
-        return None
-    return json.loads(raw)
+    return _read_jobs(r, [JOB_PREFIX + job_id])[0]
+
+
+_HAS_BLMPOP: Optional[bool] = None
+
+
+def _blmpop_supported(r: redis.Redis) -> bool:
+    """BLMPOP needs Redis >= 7.0; probed once per process via INFO server."""
+    global _HAS_BLMPOP
+    if _HAS_BLMPOP is None:
+        try:
+            version = str(r.info("server").get("redis_version", "0"))
+            _HAS_BLMPOP = int(version.split(".", 1)[0]) >= 7
+        except (redis.RedisError, ValueError):
+            _HAS_BLMPOP = False
+    return _HAS_BLMPOP
+
+
+def fetch_next_jobs_any(keys: list[str], timeout: int = 5, count: int = 8) -> List[Dict[str, Any]]:
+    """Block-pop up to `count` jobs from the first non-empty queue in `keys` (in priority order).
+    Each payload carries a _queue field with its source queue. Falls back to a single BLPOP on Redis < 7.
+    """
+    r = get_client()
+    if _blmpop_supported(r):
+        res = r.execute_command("BLMPOP", timeout, len(keys), *keys, "LEFT", "COUNT", count)
+        if not res:
+            return []
+        q_key, job_ids = res
+    else:
+        res = r.blpop(keys, timeout=timeout)
+        if not res:
+            return []
+        q_key, job_id = res
+        job_ids = [job_id]
+    # Determine job prefix by queue; one pipelined read for the whole batch
+    prefix = JD_JOB_PREFIX if q_key == JD_QUEUE_KEY else JOB_PREFIX
+    found = _read_jobs(r, [prefix + job_id for job_id in job_ids])
+    jobs = []
+    for job_id, job in zip(job_ids, found):
+        job = job or {"id": job_id}
+        job["_queue"] = q_key
+        jobs.append(job)
+    return jobs
 
 
 def fetch_next_job_any(keys: list[str], timeout: int = 5) -> Optional[Dict[str, Any]]:
     """Block-pop from any of the given queues; return job payload with a _queue field indicating source queue.
     Keys must be Redis list keys.
     """
-    r = get_client()
-    res = r.blpop(keys, timeout=timeout)
-    if not res:
-        return None
-    q_key, job_id = res
-    # Determine job prefix by queue
-    if q_key == JD_QUEUE_KEY:
-        raw = r.get(JD_JOB_PREFIX + job_id)
-    else:
-        raw = r.get(JOB_PREFIX + job_id)
-    job = json.loads(raw) if raw else {"id": job_id}
-    job["_queue"] = q_key
-    return job
+    jobs = fetch_next_jobs_any(keys, timeout=timeout, count=1)
+    return jobs[0] if jobs else None
+
+
+# KEYS = (JD job key, crawl job key). HSETs the ARGV field/value pairs on the JD job if it exists, else on the crawl job.
+# Returns the key instead of writing when it still holds a pre-hash JSON string.
+_SET_STATUS_LUA = """
+local key = KEYS[2]
+if redis.call('EXISTS', KEYS[1]) == 1 then key = KEYS[1] end
+if redis.call('TYPE', key).ok == 'string' then return key end
+redis.call('HSET', key, unpack(ARGV))
+return false
+"""
+_SET_STATUS_SCRIPT = None
 
 
 def set_job_status(job_id: str, status: str, data: Optional[Dict[str, Any]] = None, error: Optional[str] = None, artifacts: Optional[Dict[str, Any]] = None) -> None:
+    global _SET_STATUS_SCRIPT
     r = get_client()
-    # Try JD job first, then crawl
-    raw = r.get(JD_JOB_PREFIX + job_id)
-    jd = True if raw else False
-    if not raw:
-        raw = r.get(JOB_PREFIX + job_id)
-    job = json.loads(raw) if raw else {"id": job_id}
-    job["status"] = status
-    job["updated_at"] = int(time.time())
+    if _SET_STATUS_SCRIPT is None:
+        _SET_STATUS_SCRIPT = r.register_script(_SET_STATUS_LUA)
+    fields: Dict[str, Any] = {"id": job_id, "status": status, "updated_at": int(time.time())}
     if data is not None:
-        job["data"] = data
+        fields["data"] = data
     if error is not None:
-        job["error"] = error
+        fields["error"] = error
     if artifacts is not None:
-        job["artifacts"] = artifacts
-    if jd:
-        r.set(JD_JOB_PREFIX + job_id, json.dumps(job))
-    else:
-        r.set(JOB_PREFIX + job_id, json.dumps(job))
+        fields["artifacts"] = artifacts
+    args = [part for item in _encode_fields(fields).items() for part in item]
+    legacy_key = _SET_STATUS_SCRIPT(keys=[JD_JOB_PREFIX + job_id, JOB_PREFIX + job_id], args=args, client=r)
+    if legacy_key:
+        # Convert the JSON string job in place
+        raw = r.get(legacy_key)
+        job = _load(raw) if raw else {}
+        job.update(fields)
+        with r.pipeline(transaction=True) as pipe:
+            pipe.delete(legacy_key)
+            pipe.hset(legacy_key, mapping=_encode_fields(job))
+            pipe.execute()
+
+
+def get_jobs_many(job_ids: List[str]) -> List[Optional[Dict[str, Any]]]:
+    """Fetch payloads for many job ids in one pipelined round-trip; JD jobs take precedence over crawl jobs with the same id."""
+    if not job_ids:
+        return []
+    keys = [JD_JOB_PREFIX + job_id for job_id in job_ids]
+    keys.extend(JOB_PREFIX + job_id for job_id in job_ids)
+    jobs = _read_jobs(get_client(), keys)
+    n = len(job_ids)
+    return [jd or crawl for jd, crawl in zip(jobs[:n], jobs[n:])]
 
 
 def get_job(job_id: str) -> Optional[Dict[str, Any]]:
-    r = get_client()
-    raw = r.get(JD_JOB_PREFIX + job_id)
-    if not raw:
-        raw = r.get(JOB_PREFIX + job_id)
-    return json.loads(raw) if raw else None
+    return get_jobs_many([job_id])[0]
@@ -284,6 +284,7 @@ async def process_jd_job(job: Dict[str, Any]) -> None:
 
 async def main() -> None:
     while True:
+        # One job per pop: popped-but-unprocessed jobs would be lost if the worker died mid-batch
         job = fetch_next_job_any([JD_QUEUE_KEY, QUEUE_KEY], timeout=5)
         if not job:
             await asyncio.sleep(0.5)